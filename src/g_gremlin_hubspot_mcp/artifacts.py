@@ -5,17 +5,31 @@ Handles:
 - Cleanup policy (auto-delete vs --keep-files)
 - Inline vs artifact decision based on file size
 - Cross-platform path handling via pathlib
+- JSON plan/artifact loading (simdjson or orjson when installed)
 """
 
 from __future__ import annotations
 
+import json
 import os
+import re
 import shutil
-import uuid
-from dataclasses import asdict, dataclass, field
+import tempfile
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+try:  # optional speedups: pip install "g-gremlin-hubspot-mcp[fast]"
+    import simdjson
+except ImportError:  # pragma: no cover - exercised when simdjson is absent
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
 
 @dataclass
 class Artifact:
@@ -29,7 +43,17 @@ class Artifact:
     mime: str = "text/csv"
 
     def to_dict(self) -> dict[str, Any]:
-        return {k: v for k, v in asdict(self).items() if v}
+        # Explicit fields rather than dataclasses.asdict, which deep-copies
+        # the columns list for every envelope carrying an artifact.
+        fields = {
+            "type": self.type,
+            "path": self.path,
+            "row_count": self.row_count,
+            "columns": self.columns,
+            "size_bytes": self.size_bytes,
+            "mime": self.mime,
+        }
+        return {k: v for k, v in fields.items() if v}
 
 # Default artifact directory
 DEFAULT_ARTIFACT_DIR = Path.home() / ".g_gremlin" / "mcp_tmp"
@@ -37,25 +61,55 @@ DEFAULT_ARTIFACT_DIR = Path.home() / ".g_gremlin" / "mcp_tmp"
 # Files smaller than this are inlined in data; larger become artifacts
 MAX_INLINE_BYTES = 64 * 1024  # 64 KB
 
+# Read sizes used when scanning CSV artifacts for header and row count
+CSV_HEADER_PROBE_BYTES = 4096
+CSV_SCAN_CHUNK_BYTES = 1 << 20  # 1 MiB
+
+# MIME types reported for artifact files, by lowercase suffix
+_MIME_MAP = {
+    ".csv": "text/csv",
+    ".json": "application/json",
+    ".txt": "text/plain",
+}
+
 # Whether to keep temp files after tool execution (debug mode)
 _keep_files = os.environ.get("GREMLIN_MCP_KEEP_FILES", "").lower() in ("1", "true", "yes")
 
+# stat() results for artifact paths, so the inline decision and metadata
+# for one file share a single syscall. Bounded; entries under a run dir are
+# dropped when it is cleaned up. read_csv_metadata runs in worker threads,
+# so every access goes through _stat_lock.
+_STAT_CACHE_MAX = 256
+_stat_cache: dict[str, os.stat_result] = {}
+_stat_lock = threading.Lock()
+
+# Artifact base dirs already created by this process (keyed by path, since
+# GREMLIN_MCP_ARTIFACT_DIR may change between calls).
+_created_artifact_dirs: set[str] = set()
+
 
 def get_artifact_dir() -> Path:
     """Get or create the managed artifact directory."""
     artifact_dir = Path(
         os.environ.get("GREMLIN_MCP_ARTIFACT_DIR", str(DEFAULT_ARTIFACT_DIR))
     )
-    artifact_dir.mkdir(parents=True, exist_ok=True)
+    key = str(artifact_dir)
+    if key not in _created_artifact_dirs:
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        _created_artifact_dirs.add(key)
     return artifact_dir
 
 
 def create_temp_dir() -> Path:
     """Create a unique temp directory for a single tool invocation."""
     base = get_artifact_dir()
-    run_dir = base / uuid.uuid4().hex[:12]
-    run_dir.mkdir(parents=True, exist_ok=True)
-    return run_dir
+    try:
+        # One mkdir syscall; mkdtemp retries on name collisions itself
+        return Path(tempfile.mkdtemp(dir=base))
+    except FileNotFoundError:
+        # Base dir removed since we created it (e.g. a tmp cleaner)
+        base.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(dir=base))
 
 
 def temp_file_path(run_dir: Path, filename: str) -> Path:
@@ -63,57 +117,260 @@ def temp_file_path(run_dir: Path, filename: str) -> Path:
     return run_dir / filename
 
 
+def _stat_cached(path: Path) -> os.stat_result | None:
+    """stat() a path once; failures are not cached."""
+    key = str(path)
+    with _stat_lock:
+        cached = _stat_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    with _stat_lock:
+        if key not in _stat_cache and len(_stat_cache) >= _STAT_CACHE_MAX:
+            del _stat_cache[next(iter(_stat_cache))]
+        _stat_cache[key] = st
+    return st
+
+
+def invalidate_stat(path: Path) -> None:
+    """Drop cached stat() results for a path and anything beneath it."""
+    key = str(path)
+    prefix = key.rstrip(os.sep) + os.sep
+    with _stat_lock:
+        for cached in [k for k in _stat_cache if k == key or k.startswith(prefix)]:
+            del _stat_cache[cached]
+
+
 def cleanup_run_dir(run_dir: Path) -> None:
     """Remove a run directory unless keep_files is enabled."""
     if _keep_files:
         return
-    try:
-        shutil.rmtree(run_dir, ignore_errors=True)
-    except Exception:
-        pass
+    invalidate_stat(run_dir)
+    # rmtree already walks with scandir and unlinks relative to the open
+    # directory fd (unlinkat) on platforms that support it; run dirs hold a
+    # handful of files, so batching the unlinks would not pay off.
+    shutil.rmtree(run_dir, ignore_errors=True)
 
 
 def should_inline(file_path: Path) -> bool:
     """Decide whether a file should be inlined in data or referenced as an artifact."""
-    try:
-        return file_path.stat().st_size <= MAX_INLINE_BYTES
-    except OSError:
-        return True
+    st = _stat_cached(file_path)
+    return st is None or st.st_size <= MAX_INLINE_BYTES
 
 
 def file_metadata(file_path: Path) -> dict:
     """Get metadata about a file for artifact responses."""
-    try:
-        stat = file_path.stat()
-        size = stat.st_size
-    except OSError:
-        size = 0
-
-    suffix = file_path.suffix.lower()
-    mime_map = {
-        ".csv": "text/csv",
-        ".json": "application/json",
-        ".txt": "text/plain",
-    }
+    st = _stat_cached(file_path)
+    size = st.st_size if st is not None else 0
 
     return {
         "path": str(file_path),
         "size_bytes": size,
-        "mime": mime_map.get(suffix, "application/octet-stream"),
+        "mime": _MIME_MAP.get(file_path.suffix.lower(), "application/octet-stream"),
     }
 
 
+# Bytes that may border a quoted field: delimiter, line break, file start
+_CSV_FIELD_EDGES = (b"", b",", b"\n", b"\r")
+
+# Maps quotes to '"', field edges to ',' and every other byte to 'x', so
+# '"x' / 'x"' in a translated run of segments marks a quote off a field edge.
+_CSV_EDGE_CLASSES = bytes(
+    byte if byte in b'",' else ord(",") if byte in b"\r\n" else ord("x")
+    for byte in range(256)
+)
+
+
+def _find_line_end(data: bytes) -> int:
+    """Index of the first \\r or \\n in data, or -1."""
+    cr = data.find(b"\r")
+    lf = data.find(b"\n", 0, cr if cr != -1 else len(data))
+    return cr if lf == -1 else lf
+
+
+def _count_line_ends(data: bytes) -> int:
+    """Universal-newline line ends in data (\\n, \\r\\n and bare \\r)."""
+    count = data.count(b"\n")
+    if crs := data.count(b"\r"):
+        count += crs - data.count(b"\r\n")
+    return count
+
+
+def _scan_csv(fd: int) -> tuple[bytes, int] | None:
+    """Return the header line and data row count from an open CSV fd.
+
+    Uses raw os.read calls on one descriptor and counts line ends with
+    bytes.count, treating \\n, \\r\\n and a bare \\r as one line end each
+    like the universal-newline text mode this replaces. Newlines inside quoted fields are not row breaks, so chunks
+    containing a double quote are split on it and only the segments outside
+    quotes are counted, with the quote parity carried across chunks.
+    Escaped quotes ("") toggle the parity twice and need no special case.
+
+    Returns None when the quoting is not plain RFC 4180 (a quote that does
+    not open or close at a field edge, or an unterminated quoted field),
+    since csv.reader treats such quotes as literal characters.
+    """
+    header: bytes | None = None
+    consumed = b""  # bytes read so far, kept only until the header is found
+    newlines = 0
+    in_quotes = False  # quote parity at the start of the current chunk
+    after_close = False  # a quoted field just closed; no byte seen since
+    last = b""  # last byte outside quotes (b"" at file start)
+    tail = b""  # last byte of the file
+
+    chunk = os.read(fd, CSV_HEADER_PROBE_BYTES)
+    while chunk:
+        if tail == b"\r" and chunk[:1] == b"\n" and not in_quotes:
+            newlines -= 1  # a \r\n split across two reads was counted twice
+        tail = chunk[-1:]
+        parts = chunk.split(b'"')
+        final = len(parts) - 1  # index of the last part = quotes in chunk
+        first = 1 if in_quotes else 0  # index of the first outside part
+
+        if header is None:
+            offset = 0
+            for i, part in enumerate(parts):
+                if (i - first) % 2 == 0 and (idx := _find_line_end(part)) != -1:
+                    header = consumed + chunk[:offset + idx]
+                    break
+                offset += len(part) + 1
+            else:
+                consumed += chunk
+
+        if not final:
+            if not in_quotes:
+                if after_close and chunk[:1] not in _CSV_FIELD_EDGES:
+                    return None  # text after a closing quote
+                after_close = False
+                last = tail
+                newlines += _count_line_ends(chunk)
+            chunk = os.read(fd, CSV_SCAN_CHUNK_BYTES)
+            continue
+
+        # parts[0] and parts[final] continue segments from neighbouring
+        # chunks and are checked against the carried state; the outside
+        # parts between them are whole segments, checked in one pass.
+        if not in_quotes:
+            lead = parts[0]
+            if after_close and lead[:1] not in _CSV_FIELD_EDGES:
+                return None  # text after a closing quote
+            end = lead[-1:] if lead else (b"" if after_close else last)
+            if end not in _CSV_FIELD_EDGES:
+                return None  # quote opens mid-field
+            newlines += _count_line_ends(lead)
+        middle = parts[2 - first:final:2]
+        if middle:
+            joined = b'"' + b'"'.join(middle) + b'"'
+            classes = joined.translate(_CSV_EDGE_CLASSES)
+            if b'"x' in classes or b'x"' in classes:
+                return None  # quote opens or closes mid-field
+            newlines += _count_line_ends(joined)
+        in_quotes ^= final % 2 == 1
+        if not in_quotes:
+            trail = parts[final]
+            if trail[:1] not in _CSV_FIELD_EDGES:
+                return None  # text after a closing quote
+            after_close = not trail
+            last = trail[-1:]
+            newlines += _count_line_ends(trail)
+        chunk = os.read(fd, CSV_SCAN_CHUNK_BYTES)
+
+    if in_quotes:
+        return None  # unterminated quoted field
+    if header is None:
+        return consumed, 0  # header only, no trailing newline
+    rows = newlines - 1  # the header's own line break
+    if tail not in (b"\n", b"\r"):
+        rows += 1  # final line without trailing newline
+    return header, rows
+
+
+def _parse_csv_metadata(file_path: Path) -> tuple[list[str], int]:
+    """Columns and row count via the csv module, for quoting _scan_csv rejects."""
+    import csv
+
+    with open(file_path, encoding="utf-8", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        row_count = sum(1 for _ in reader)
+    return [c.strip() for c in header if c.strip()], row_count
+
+
 def read_csv_metadata(file_path: Path) -> dict:
     """Read CSV file and extract column names and row count."""
     meta = file_metadata(file_path)
     try:
-        with file_path.open("r", encoding="utf-8") as f:
-            header = f.readline().strip()
-            columns = [c.strip() for c in header.split(",") if c.strip()]
-            row_count = sum(1 for _ in f)  # count remaining lines
-        meta["columns"] = columns
-        meta["row_count"] = row_count
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            if meta["size_bytes"] > MAX_INLINE_BYTES and hasattr(os, "posix_fadvise"):
+                # One sequential pass over a large artifact: ask for
+                # aggressive readahead.
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            scanned = _scan_csv(fd)
+        finally:
+            os.close(fd)
+        if scanned is None:
+            meta["columns"], meta["row_count"] = _parse_csv_metadata(file_path)
+        else:
+            header_bytes, row_count = scanned
+            header = header_bytes.decode("utf-8", errors="replace").strip()
+            if '"' in header:
+                import csv
+
+                fields = next(csv.reader([header]), [])
+            else:
+                fields = header.split(",")
+            meta["columns"] = [c.strip() for c in fields if c.strip()]
+            meta["row_count"] = row_count
     except Exception:
         meta["columns"] = []
         meta["row_count"] = 0
     return meta
+
+
+# orjson silently turns integers outside the int64/uint64 range into floats.
+# Any such literal has at least 19 digits; send those documents to json.
+_WIDE_INT_RE = re.compile(rb"\d{19}")
+
+# simdjson parsers keep their tape/string buffers between documents, so reuse
+# one per thread (a Parser must not be shared across threads).
+_parsers = threading.local()
+
+
+def simdjson_parser() -> Any:
+    """Per-thread simdjson parser; shared by artifact loading and envelopes."""
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        parser = _parsers.parser = simdjson.Parser()
+    return parser
+
+
+def parse_json_bytes(data: bytes) -> Any:
+    """Parse a JSON document (e.g. a merge plan) into plain Python objects.
+
+    Uses simdjson or, failing that, orjson, falling back to the stdlib for
+    documents they would reject or mangle (integers wider than 64 bits) or
+    when neither is installed. Raises ValueError if it is not valid JSON.
+    """
+    if simdjson is not None:
+        try:
+            return simdjson_parser().parse(data, True)
+        except (ValueError, RuntimeError):  # RuntimeError: BIGINT_ERROR
+            pass
+    elif orjson is not None and not _WIDE_INT_RE.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def read_json_file(file_path: Path) -> Any:
+    """Load a JSON file into plain Python objects (see parse_json_bytes).
+
+    Raises OSError if the file cannot be read.
+    """
+    return parse_json_bytes(file_path.read_bytes())
@@ -6,15 +6,24 @@ for reliable LLM tool chaining.
 
 from __future__ import annotations
 
+import base64
 import hashlib
 import json
 import re
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 from g_gremlin_hubspot_mcp import MIN_GREMLIN_VERSION
 from g_gremlin_hubspot_mcp.artifacts import Artifact  # noqa: F401 — re-exported
+from g_gremlin_hubspot_mcp.artifacts import (  # optional [fast] speedups, or None
+    orjson,
+    simdjson,
+    simdjson_parser,
+)
 from g_gremlin_hubspot_mcp.runner import RunResult
 
 
@@ -50,66 +59,250 @@ class Warning:
         return {"code": self.code, "message": self.message, "severity": self.severity}
 
 
+_AGENTIC_MARKER = "AgenticResult/v1"
+
+# Flat JSON object carrying the AgenticResult/v1 schema marker. Quantifiers
+# are bounded so a failed match cannot rescan the whole of a large stdout
+# from every '{'.
+_AGENTIC_RE = re.compile(
+    r'\{[^{}]{0,4096}"\$schema"\s*:\s*"AgenticResult/v1"[^}]{0,65536}\}',
+    re.DOTALL,
+)
+
+# First characters of any JSON value json.loads accepts (NaN/Infinity too)
+_JSON_VALUE_START = frozenset('{["-0123456789tfnNI')
+
+# A line whose first non-blank character opens a JSON object or array
+_JSON_LINE_START_RE = re.compile(r"^[ \t]*[\[{]", re.MULTILINE)
+
+_DECODER = json.JSONDecoder()
+
+# Envelopes built within this many seconds share one formatted timestamp
+_TIMESTAMP_TTL = 0.05
+_last_timestamp: tuple[float, str] = (float("-inf"), "")
+
+# Canonical JSON for plan hashes: json.dumps(sort_keys=True, separators=(",", ":")),
+# including its default ensure_ascii, so hashes match earlier releases
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+# Buffer this much canonical text before feeding it to the hasher
+_HASH_FEED_CHARS = 64 * 1024
+
+# Top-level list elements encoded per one-shot encode() call
+_HASH_LIST_BATCH = 256
+
+
+def _canonical_chunks(data: Any) -> Iterator[str]:
+    """Yield the canonical encoding of data in batches of top-level elements.
+
+    Each batch goes through the C-backed one-shot encode(), so large plans
+    are never held as one string yet avoid iterencode()'s pure-Python path.
+    Joined, the chunks equal _CANONICAL_ENCODER.encode(data).
+    """
+    encode = _CANONICAL_ENCODER.encode
+    if isinstance(data, dict) and all(isinstance(key, str) for key in data):
+        yield "{"
+        for index, key in enumerate(sorted(data)):
+            yield ("," if index else "") + encode(key) + ":"
+            value = data[key]
+            if isinstance(value, list):
+                yield from _canonical_chunks(value)  # e.g. a plan's "groups"
+            else:
+                yield encode(value)
+        yield "}"
+    elif isinstance(data, list):
+        yield "["
+        for start in range(0, len(data), _HASH_LIST_BATCH):
+            # encode() of a slice is "[a,b,...]"; drop the brackets
+            yield ("," if start else "") + encode(data[start:start + _HASH_LIST_BATCH])[1:-1]
+        yield "]"
+    else:
+        yield encode(data)
+
+
+def _hash_canonical_json(hasher: Any, data: Any) -> None:
+    """Feed the canonical JSON encoding of data into hasher.
+
+    Always the stdlib encoder: orjson renders floats (1e16 vs 1e+16) and
+    NaN differently, and the hash must not depend on whether it is
+    installed. The encoding is streamed instead of built as one string.
+    """
+    pending: list[str] = []
+    pending_chars = 0
+    for chunk in _canonical_chunks(data):
+        pending.append(chunk)
+        pending_chars += len(chunk)
+        if pending_chars >= _HASH_FEED_CHARS:
+            hasher.update("".join(pending).encode("utf-8"))
+            pending.clear()
+            pending_chars = 0
+    if pending:
+        hasher.update("".join(pending).encode("utf-8"))
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO 8601, re-formatted at most every 50 ms."""
+    global _last_timestamp
+    now = time.monotonic()
+    cached_at, cached = _last_timestamp
+    if now - cached_at < _TIMESTAMP_TTL:
+        return cached
+    stamp = datetime.now(timezone.utc).isoformat()
+    _last_timestamp = (now, stamp)
+    return stamp
+
+
+# meta.requires_g_gremlin is the same for every envelope
+_META_REQUIRES = f">={MIN_GREMLIN_VERSION}"
+
+# Safety block for envelopes built without explicit safety metadata. Shared
+# read-only; envelopes are serialized immediately and never mutated.
+_DEFAULT_SAFETY_DICT = Safety(impact="read").to_dict()
+
+
+def _format_sha256(digest: bytes) -> str:
+    """Render a SHA-256 digest as ``sha256:<base64url, no padding>`` (43 chars)."""
+    return "sha256:" + base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
 def compute_plan_hash(plan_data: Any) -> str:
-    """SHA-256 hash of plan JSON for two-phase apply verification."""
-    canonical = json.dumps(plan_data, sort_keys=True, separators=(",", ":"))
-    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
-    return f"sha256:{digest}"
+    """SHA-256 hash of plan JSON for two-phase apply verification.
+
+    hashlib's sha256 is OpenSSL-backed on standard CPython builds and picks
+    up the CPU's SHA extensions (SHA-NI / ARMv8 SHA2) at runtime.
+    """
+    hasher = hashlib.sha256()
+    _hash_canonical_json(hasher, plan_data)
+    return _format_sha256(hasher.digest())
+
+
+def compute_bytes_hash(data: bytes) -> str:
+    """SHA-256 hash of raw plan bytes; equals compute_file_hash of the file."""
+    return _format_sha256(hashlib.sha256(data).digest())
+
+
+_FILE_HASH_CHUNK_BYTES = 64 * 1024
+
 
+def compute_file_hash(file_path: Path) -> str:
+    """SHA-256 hash of a plan file's raw bytes, streamed in 64 KiB chunks.
 
-def _extract_agentic_result(stdout: str) -> dict[str, Any] | None:
+    Used for plans that stay on disk as artifacts: the hash is over the exact
+    bytes g-gremlin wrote, so no JSON tree is built. Raises OSError if the
+    file cannot be read.
+    """
+    hasher = hashlib.sha256()
+    # Unbuffered readinto() a reused buffer: one copy per chunk, no per-chunk
+    # bytes objects (same approach as hashlib.file_digest, which is 3.11+).
+    buf = bytearray(_FILE_HASH_CHUNK_BYTES)
+    view = memoryview(buf)
+    with open(file_path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
+    return _format_sha256(hasher.digest())
+
+
+def extract_agentic_result(stdout: str) -> dict[str, Any] | None:
     """Extract AgenticResult JSON from g-gremlin stdout.
 
     g-gremlin emits AgenticResult as a JSON block (usually the last JSON
-    object in stdout when --json-summary is used).
+    object in stdout when --json-summary is used). Output without the
+    AgenticResult/v1 marker is not an AgenticResult, so it is rejected
+    up front and plain --json output is left to _extract_json_output.
     """
+    if _AGENTIC_MARKER not in stdout:
+        return None
+
     # Try to find JSON with AgenticResult schema marker
-    for match in re.finditer(r'\{[^{}]*"\$schema"\s*:\s*"AgenticResult/v1"[^}]*\}', stdout, re.DOTALL):
+    for match in _AGENTIC_RE.finditer(stdout):
         try:
             return json.loads(match.group())
         except json.JSONDecodeError:
             continue
 
-    # Fallback: try parsing the last JSON object in stdout
-    lines = stdout.strip().splitlines()
-    json_start = None
-    for i in range(len(lines) - 1, -1, -1):
-        stripped = lines[i].strip()
-        if stripped.startswith("{"):
-            json_start = i
-            break
-    if json_start is not None:
-        candidate = "\n".join(lines[json_start:])
+    # Fallback: the last JSON object in stdout, i.e. the outermost '{' whose
+    # object runs to the end of the output. Walk candidates backwards with
+    # rfind and decode in place rather than splitting/re-joining lines.
+    text = stdout.rstrip()
+    end = len(text)
+    idx = text.rfind("{")
+    while idx != -1:
         try:
-            parsed = json.loads(candidate)
-            if isinstance(parsed, dict):
-                return parsed
+            parsed, stop = _DECODER.raw_decode(text, idx)
         except json.JSONDecodeError:
             pass
+        else:
+            if stop == end and isinstance(parsed, dict):
+                return parsed
+        idx = text.rfind("{", 0, idx)
 
     return None
 
 
+def agentic_summary(agentic: dict[str, Any] | None) -> dict[str, Any]:
+    """The ``result`` block of an extracted AgenticResult, or {} if absent."""
+    summary = agentic.get("result") if agentic else None
+    return summary if isinstance(summary, dict) else {}
+
+
 def _extract_json_output(stdout: str) -> Any | None:
     """Try to parse stdout as JSON (for --json flag commands)."""
     stripped = stdout.strip()
-    try:
-        return json.loads(stripped)
-    except json.JSONDecodeError:
-        pass
+    if not stripped:
+        return None
+    if stripped[0] in _JSON_VALUE_START:
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
 
     # Try extracting just the JSON portion (skip non-JSON prefix lines)
-    lines = stripped.splitlines()
-    for i, line in enumerate(lines):
-        if line.strip().startswith(("{", "[")):
-            candidate = "\n".join(lines[i:])
-            try:
-                return json.loads(candidate)
-            except json.JSONDecodeError:
-                continue
+    end = len(stripped)
+    for match in _JSON_LINE_START_RE.finditer(stripped):
+        try:
+            parsed, stop = _DECODER.raw_decode(stripped, match.end() - 1)
+        except json.JSONDecodeError:
+            continue
+        if stop == end:
+            return parsed
     return None
 
 
+def _raw_json_object(stdout: str) -> str | None:
+    """Return stdout (stripped) if it is exactly one non-empty plain JSON object.
+
+    With simdjson the document is validated in C without building Python
+    objects. AgenticResult output is excluded; it is unwrapped, not forwarded.
+    An empty object is excluded too: the decode path reports it as text.
+    """
+    text = stdout.strip()
+    if not text.startswith("{") or _AGENTIC_MARKER in text or not text[1:-1].strip():
+        return None
+    try:
+        if simdjson is not None:
+            # Discard the lazy document at once so the parser can be reused
+            simdjson_parser().parse(text.encode("utf-8"))
+        else:
+            json.loads(text)
+    except (ValueError, RuntimeError):  # RuntimeError: simdjson BIGINT_ERROR
+        return None
+    return text
+
+
+# Default for build_envelope(agentic_result=...): extract it from stdout
+_EXTRACT: Any = object()
+
+
+def _dumps_envelope(envelope: dict[str, Any]) -> str:
+    """Serialize an envelope as indented JSON, natively when orjson is present."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(envelope, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except (TypeError, orjson.JSONEncodeError):
+            pass  # e.g. integers wider than 64 bits from CLI output
+    return json.dumps(envelope, indent=2)
+
+
 def build_envelope(
     *,
     run_result: RunResult,
@@ -118,17 +311,43 @@ def build_envelope(
     safety: Safety | None = None,
     extra_data: dict[str, Any] | None = None,
     extra_warnings: list[Warning] | None = None,
+    passthrough_json: bool = False,
+    agentic_result: dict[str, Any] | None = _EXTRACT,
 ) -> str:
-    """Build a GremlinMCPResponse/v1 JSON string from a RunResult."""
-    agentic = _extract_agentic_result(run_result.stdout)
-    json_output = _extract_json_output(run_result.stdout)
+    """Build a GremlinMCPResponse/v1 JSON string from a RunResult.
+
+    With passthrough_json=True (for plain --json commands), stdout that is a
+    single JSON object is validated and emitted verbatim as ``data`` (the
+    last key of the envelope) instead of being decoded and re-encoded.
+    Anything else takes the normal path.
+
+    Callers that already ran extract_agentic_result on this stdout pass the
+    result (None included) as agentic_result so stdout is not scanned again.
+    """
+    raw_data = (
+        _raw_json_object(run_result.stdout)
+        if passthrough_json and not extra_data
+        else None
+    )
+    if raw_data is not None:
+        agentic = None
+        json_output = None
+    else:
+        agentic = (
+            extract_agentic_result(run_result.stdout)
+            if agentic_result is _EXTRACT
+            else agentic_result
+        )
+        json_output = _extract_json_output(run_result.stdout)
 
     # Determine ok status
     ok = run_result.ok
 
     # Build data from agentic result or raw JSON
-    data: dict[str, Any] = {}
-    if agentic:
+    data: Any = {}
+    if raw_data is not None:
+        agentic_warnings = []  # data is appended after serialization
+    elif agentic:
         data = agentic.get("result", {})
         # Extract warnings from agentic result
         agentic_warnings = agentic.get("warnings", [])
@@ -171,8 +390,9 @@ def build_envelope(
         "$schema": "GremlinMCPResponse/v1",
         "ok": ok,
         "summary": summary,
-        "data": data,
     }
+    if raw_data is None:
+        envelope["data"] = data
 
     if artifact:
         envelope["artifact"] = artifact.to_dict()
@@ -180,8 +400,7 @@ def build_envelope(
     if warnings:
         envelope["warnings"] = warnings
 
-    effective_safety = safety or Safety(impact="read")
-    envelope["safety"] = effective_safety.to_dict()
+    envelope["safety"] = safety.to_dict() if safety else _DEFAULT_SAFETY_DICT
 
     envelope["raw"] = {
         "agentic_result": agentic,
@@ -190,11 +409,15 @@ def build_envelope(
     }
 
     envelope["meta"] = {
-        "requires_g_gremlin": f">={MIN_GREMLIN_VERSION}",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "requires_g_gremlin": _META_REQUIRES,
+        "timestamp": _now_iso(),
     }
 
-    return json.dumps(envelope, indent=2)
+    text = _dumps_envelope(envelope)
+    if raw_data is None:
+        return text
+    # The indented envelope ends with "\n}"; add the raw object as the last member
+    return f'{text[:-2]},\n  "data": {raw_data}\n}}'
 
 
 def error_envelope(summary: str, *, safety: Safety | None = None) -> str:
@@ -204,11 +427,11 @@ def error_envelope(summary: str, *, safety: Safety | None = None) -> str:
         "ok": False,
         "summary": summary,
         "data": {},
-        "safety": (safety or Safety(impact="read")).to_dict(),
+        "safety": safety.to_dict() if safety else _DEFAULT_SAFETY_DICT,
         "raw": {"agentic_result": None, "exit_code": -1, "stderr": ""},
         "meta": {
-            "requires_g_gremlin": f">={MIN_GREMLIN_VERSION}",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "requires_g_gremlin": _META_REQUIRES,
+            "timestamp": _now_iso(),
         },
     }
-    return json.dumps(envelope, indent=2)
+    return _dumps_envelope(envelope)
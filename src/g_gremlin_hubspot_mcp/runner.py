@@ -9,7 +9,9 @@ Handles:
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+import re
 import shutil
 import sys
 from asyncio.subprocess import PIPE, DEVNULL
@@ -17,15 +19,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Sequence
 
-from packaging.version import Version, InvalidVersion
-
 from g_gremlin_hubspot_mcp import MIN_GREMLIN_VERSION
 
 logger = logging.getLogger(__name__)
 
-# Cache the resolved g-gremlin path for the lifetime of the process
-_gremlin_path: str | None = None
-
 # Per-tool timeout defaults (seconds)
 TIMEOUTS = {
     "whoami": 30,
@@ -46,10 +43,18 @@ TIMEOUTS = {
 
 DEFAULT_TIMEOUT = 120
 
+# Only the last this-many bytes of stderr are decoded into RunResult.stderr.
+# The tail is kept because the CLI prints its final error (and hints such as
+# the schema cache-miss message) after any traceback or warnings.
+STDERR_CAPTURE_BYTES = 8 * 1024
+
 
 @dataclass(frozen=True)
 class RunResult:
-    """Raw result from a g-gremlin subprocess call."""
+    """Raw result from a g-gremlin subprocess call.
+
+    stderr holds at most the last STDERR_CAPTURE_BYTES of the stream.
+    """
 
     stdout: str
     stderr: str
@@ -60,33 +65,31 @@ class RunResult:
         return self.exit_code == 0
 
 
+@functools.cache
 def _find_gremlin() -> str:
     """Locate the g-gremlin executable, preferring the current venv.
 
+    The resolved path is cached for the lifetime of the process; a failed
+    lookup is not cached. Call ``_find_gremlin.cache_clear()`` to re-resolve.
+
     Resolution order:
     1. Same-venv Scripts/bin directory (avoids PATH weirdness on Windows/Mac)
     2. ``python -m g_gremlin`` via sys.executable (guaranteed same environment)
     3. PATH lookup via shutil.which (fallback)
     """
-    global _gremlin_path
-    if _gremlin_path is not None:
-        return _gremlin_path
-
     # 1. Check the Scripts/bin dir next to sys.executable
     exe_dir = Path(sys.executable).parent
     for candidate in ("g-gremlin", "g-gremlin.exe"):
         full = exe_dir / candidate
         if full.is_file():
-            _gremlin_path = str(full)
-            logger.debug("Found g-gremlin in same venv: %s", _gremlin_path)
-            return _gremlin_path
+            logger.debug("Found g-gremlin in same venv: %s", full)
+            return str(full)
 
     # 2. PATH fallback
     path = shutil.which("g-gremlin")
     if path:
-        _gremlin_path = path
-        logger.debug("Found g-gremlin on PATH: %s", _gremlin_path)
-        return _gremlin_path
+        logger.debug("Found g-gremlin on PATH: %s", path)
+        return path
 
     raise RuntimeError(
         "g-gremlin not found. Install with: pipx install g-gremlin"
@@ -106,8 +109,9 @@ async def run_raw(cmd: Sequence[str], *, timeout: int = DEFAULT_TIMEOUT) -> RunR
             proc.communicate(), timeout=timeout
         )
     except asyncio.TimeoutError:
+        # wait_for already cancelled communicate(); just reap the process.
         proc.kill()
-        await proc.communicate()
+        await proc.wait()
         return RunResult(
             stdout="",
             stderr=f"Command timed out after {timeout}s: {' '.join(cmd)}",
@@ -116,7 +120,7 @@ async def run_raw(cmd: Sequence[str], *, timeout: int = DEFAULT_TIMEOUT) -> RunR
 
     return RunResult(
         stdout=stdout_bytes.decode("utf-8", errors="replace"),
-        stderr=stderr_bytes.decode("utf-8", errors="replace"),
+        stderr=stderr_bytes[-STDERR_CAPTURE_BYTES:].decode("utf-8", errors="replace"),
         exit_code=proc.returncode or 0,
     )
 
@@ -143,6 +147,19 @@ async def run_gremlin(
     return await run_raw(cmd, timeout=effective_timeout)
 
 
+# Plain X.Y.Z releases are compared as int tuples; anything else (pre-releases,
+# local versions) goes through packaging.version.
+_RELEASE_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+
+
+def _release_tuple(version: str) -> tuple[int, ...] | None:
+    match = _RELEASE_VERSION_RE.fullmatch(version)
+    return tuple(int(part) for part in match.groups()) if match else None
+
+
+_MIN_RELEASE = _release_tuple(MIN_GREMLIN_VERSION)
+
+
 async def check_gremlin_version() -> str:
     """Verify g-gremlin is installed and meets minimum version.
 
@@ -162,6 +179,19 @@ async def check_gremlin_version() -> str:
     parts = version_str.split()
     version_str = parts[-1] if parts else version_str
 
+    release = _release_tuple(version_str)
+    if release is not None and _MIN_RELEASE is not None:
+        detected_str = ".".join(str(part) for part in release)
+        if release < _MIN_RELEASE:
+            raise RuntimeError(
+                f"g-gremlin {detected_str} found, but >={MIN_GREMLIN_VERSION} required. "
+                f"Run: pipx upgrade g-gremlin"
+            )
+        logger.info("g-gremlin %s detected (>=%s required)", detected_str, MIN_GREMLIN_VERSION)
+        return detected_str
+
+    from packaging.version import InvalidVersion, Version
+
     try:
         detected = Version(version_str)
         required = Version(MIN_GREMLIN_VERSION)
@@ -1,6 +1,9 @@
 """FastMCP server for g-gremlin HubSpot tools.
 
 Entry point: `g-gremlin-hubspot-mcp` (stdio transport)
+
+Tool implementations are imported inside each tool wrapper, so a tool
+module is only loaded the first time one of its tools is called.
 """
 
 from __future__ import annotations
@@ -14,28 +17,6 @@ from mcp.server.fastmcp import FastMCP
 from g_gremlin_hubspot_mcp import __version__
 from g_gremlin_hubspot_mcp.runner import check_gremlin_version
 
-# Import tool implementations
-from g_gremlin_hubspot_mcp.tools.read import (
-    hubspot_auth_doctor,
-    hubspot_auth_whoami,
-    hubspot_engagements_pull,
-    hubspot_objects_pull,
-    hubspot_objects_query,
-    hubspot_props_list,
-    hubspot_schema_get,
-    hubspot_schema_list,
-)
-from g_gremlin_hubspot_mcp.tools.analyze import (
-    hubspot_dedupe_plan,
-    hubspot_props_drift,
-    hubspot_snapshot_create,
-    hubspot_snapshot_diff,
-)
-from g_gremlin_hubspot_mcp.tools.mutate import (
-    hubspot_dedupe_apply,
-    hubspot_objects_upsert,
-)
-
 logger = logging.getLogger(__name__)
 
 def _create_mcp_server() -> FastMCP:
@@ -65,6 +46,8 @@ async def tool_whoami() -> str:
     """[READ] [FREE] Check HubSpot authentication and show portal identity.
     Returns the connected HubSpot portal ID, hub name, and token scopes.
     Use this to verify that the MCP server can reach HubSpot."""
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_auth_whoami
+
     return await hubspot_auth_whoami()
 
 
@@ -74,6 +57,8 @@ async def tool_doctor() -> str:
     Checks connectivity, token validity, scopes, and API accessibility.
     Returns a structured health report with pass/fail checks.
     Requires: HubSpot Admin license or active trial."""
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_auth_doctor
+
     return await hubspot_auth_doctor()
 
 
@@ -81,6 +66,8 @@ async def tool_doctor() -> str:
 async def tool_schema_list() -> str:
     """[READ] [FREE] List all HubSpot CRM object types (contacts, companies, deals, custom objects).
     Returns object type names, labels, and whether they are standard or custom."""
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_schema_list
+
     return await hubspot_schema_list()
 
 
@@ -92,19 +79,24 @@ async def tool_schema_get(object_type: str) -> str:
     Args:
         object_type: CRM object type (e.g., "contacts", "companies", "deals", or a custom object ID).
     """
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_schema_get
+
     return await hubspot_schema_get(object_type)
 
 
 @mcp.tool(name="hubspot.props.list")
-async def tool_props_list(object_types: str, match: str | None = None) -> str:
+async def tool_props_list(object_types: str | list[str], match: str | None = None) -> str:
     """[READ] [REQUIRES LICENSE] List properties for HubSpot CRM object types.
     Returns property names, types, labels, and group assignments.
+    Request all needed types in one call — they are fetched together.
     Requires: HubSpot Admin license or active trial.
 
     Args:
-        object_types: Comma-separated object types (e.g., "contacts", "contacts,companies").
+        object_types: Comma-separated object types or a list (e.g., "contacts,companies" or ["contacts", "companies"]).
         match: Optional filter string to match property names/labels.
     """
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_props_list
+
     return await hubspot_props_list(object_types, match)
 
 
@@ -124,6 +116,8 @@ async def tool_objects_query(
         properties: Comma-separated properties to include.
         limit: Max records (default 100, max 10000).
     """
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_objects_query
+
     return await hubspot_objects_query(object_type, where, properties, limit)
 
 
@@ -147,6 +141,8 @@ async def tool_objects_pull(
         limit: Max records (0 = no limit, pulls everything).
         timeout_seconds: Override timeout (default 900s / 15 min).
     """
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_objects_pull
+
     return await hubspot_objects_pull(object_type, properties, associations, limit, timeout_seconds)
 
 
@@ -168,6 +164,8 @@ async def tool_engagements_pull(
         auto_export_fallback: Switch to async export when hitting 10k (default true).
         timeout_seconds: Override timeout (default 900s / 15 min).
     """
+    from g_gremlin_hubspot_mcp.tools.read import hubspot_engagements_pull
+
     return await hubspot_engagements_pull(engagement_types, properties, limit, auto_export_fallback, timeout_seconds)
 
 
@@ -199,6 +197,8 @@ async def tool_dedupe_plan(
         auto_window: Enable date-range windowing past 10k (default true).
         timeout_seconds: Override timeout (default 900s / 15 min).
     """
+    from g_gremlin_hubspot_mcp.tools.analyze import hubspot_dedupe_plan
+
     return await hubspot_dedupe_plan(object_type, key_column, keep, where, limit, auto_window, timeout_seconds)
 
 
@@ -212,6 +212,8 @@ async def tool_props_drift(spec_path: str, timeout_seconds: int | None = None) -
         spec_path: Path to the property spec file (YAML or JSON).
         timeout_seconds: Override timeout (default 60s).
     """
+    from g_gremlin_hubspot_mcp.tools.analyze import hubspot_props_drift
+
     return await hubspot_props_drift(spec_path, timeout_seconds)
 
 
@@ -228,6 +230,8 @@ async def tool_snapshot_create(
         object_types: Comma-separated types to snapshot (omit for all standard types).
         timeout_seconds: Override timeout (default 600s / 10 min).
     """
+    from g_gremlin_hubspot_mcp.tools.analyze import hubspot_snapshot_create
+
     return await hubspot_snapshot_create(object_types, timeout_seconds)
 
 
@@ -245,6 +249,8 @@ async def tool_snapshot_diff(
         snapshot_b: Path to the second (newer) snapshot directory.
         timeout_seconds: Override timeout (default 600s / 10 min).
     """
+    from g_gremlin_hubspot_mcp.tools.analyze import hubspot_snapshot_diff
+
     return await hubspot_snapshot_diff(snapshot_a, snapshot_b, timeout_seconds)
 
 
@@ -276,6 +282,8 @@ async def tool_objects_upsert(
         batch_size: Optional batch size override (max 100).
         timeout_seconds: Override timeout (default 900s / 15 min).
     """
+    from g_gremlin_hubspot_mcp.tools.mutate import hubspot_objects_upsert
+
     return await hubspot_objects_upsert(object_type, csv_path, id_column, apply, plan_hash, batch_size, timeout_seconds)
 
 
@@ -297,6 +305,8 @@ async def tool_dedupe_apply(
         plan_hash: Required when apply=true. Must match plan generation hash.
         timeout_seconds: Override timeout (default 900s / 15 min).
     """
+    from g_gremlin_hubspot_mcp.tools.mutate import hubspot_dedupe_apply
+
     return await hubspot_dedupe_apply(plan_file, apply, plan_hash, timeout_seconds)
 
 
@@ -9,7 +9,8 @@ Tools:
 
 from __future__ import annotations
 
-import json
+import asyncio
+import os
 from pathlib import Path
 from typing import Any
 
@@ -18,17 +19,58 @@ from g_gremlin_hubspot_mcp.artifacts import (
     cleanup_run_dir,
     create_temp_dir,
     file_metadata,
+    read_json_file,
     should_inline,
     temp_file_path,
 )
 from g_gremlin_hubspot_mcp.envelope import (
     Safety,
+    agentic_summary,
     build_envelope,
+    compute_file_hash,
     compute_plan_hash,
+    extract_agentic_result,
 )
 from g_gremlin_hubspot_mcp.runner import run_gremlin
 
 
+def _count_files(root: Path) -> int:
+    """Number of regular files under *root* (recursive, symlinks not followed).
+
+    Uses os.scandir so file types come from the directory entries instead of
+    one stat() per path.
+    """
+    count = 0
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    count += 1
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    return count
+
+
+def _plan_counts(cli_result: dict[str, Any], plan_data: Any) -> dict[str, int]:
+    """duplicate_groups / total_merges, preferring the CLI's --json-summary."""
+    groups_found = cli_result.get("groups_found")
+    total_merges = cli_result.get("total_merges")
+    if isinstance(groups_found, int) and isinstance(total_merges, int):
+        return {"duplicate_groups": groups_found, "total_merges": total_merges}
+    if isinstance(plan_data, dict):
+        groups = plan_data.get("groups", [])
+        return {
+            "duplicate_groups": len(groups),
+            "total_merges": sum(len(g.get("secondaries", [])) for g in groups),
+        }
+    return {}
+
+
 async def hubspot_dedupe_plan(
     object_type: str,
     key_column: str,
@@ -84,24 +126,21 @@ async def hubspot_dedupe_plan(
     extra_data: dict[str, Any] = {}
     artifact = None
     plan_hash = ""
+    plan_data: Any = None
 
-    if result.ok and plan_path.exists():
+    if result.ok:
         try:
-            plan_data = json.loads(plan_path.read_text(encoding="utf-8"))
-            plan_hash = compute_plan_hash(plan_data)
-
             if should_inline(plan_path):
+                # Inline plans are deleted below and echoed back as JSON, so
+                # they hash canonically over the parsed document.
+                plan_data = read_json_file(plan_path)
+                plan_hash = compute_plan_hash(plan_data)
                 extra_data["plan"] = plan_data
                 extra_data["plan_hash"] = plan_hash
-                # Extract summary stats from plan
-                groups = plan_data.get("groups", [])
-                total_merges = sum(
-                    len(g.get("secondaries", [])) for g in groups
-                )
-                extra_data["duplicate_groups"] = len(groups)
-                extra_data["total_merges"] = total_merges
                 cleanup_run_dir(run_dir)
             else:
+                # Artifact plans stay on disk: hash the bytes, skip parsing.
+                plan_hash = compute_file_hash(plan_path)
                 meta = file_metadata(plan_path)
                 artifact = Artifact(
                     path=str(plan_path),
@@ -109,11 +148,18 @@ async def hubspot_dedupe_plan(
                     mime="application/json",
                 )
                 extra_data["plan_hash"] = plan_hash
-        except (json.JSONDecodeError, OSError):
+        except FileNotFoundError:
+            pass  # the CLI wrote no plan
+        except (ValueError, OSError):
             extra_data["plan_path"] = str(plan_path)
-    elif not result.ok:
+    else:
         cleanup_run_dir(run_dir)
 
+    agentic = extract_agentic_result(result.stdout)
+    if result.ok:
+        # Summary counts come from the CLI; walking the plan is the fallback
+        extra_data.update(_plan_counts(agentic_summary(agentic), plan_data))
+
     summary = (
         f"Found {extra_data.get('duplicate_groups', '?')} duplicate groups, "
         f"{extra_data.get('total_merges', '?')} merges planned"
@@ -129,6 +175,7 @@ async def hubspot_dedupe_plan(
             impact="analyze",
             plan_hash=plan_hash,
         ),
+        agentic_result=agentic,
     )
 
 
@@ -158,6 +205,7 @@ async def hubspot_props_drift(
         run_result=result,
         summary="Property drift analysis" if result.ok else "Property drift check failed",
         safety=Safety(impact="analyze"),
+        passthrough_json=True,
     )
 
 
@@ -193,11 +241,10 @@ async def hubspot_snapshot_create(
     )
 
     extra_data: dict[str, Any] = {}
-    if result.ok and snapshot_dir.exists():
-        files = list(snapshot_dir.rglob("*"))
+    if result.ok:  # snapshot_dir was created above
         extra_data["snapshot_dir"] = str(snapshot_dir)
-        extra_data["file_count"] = len([f for f in files if f.is_file()])
-    elif not result.ok:
+        extra_data["file_count"] = await asyncio.to_thread(_count_files, snapshot_dir)
+    else:
         cleanup_run_dir(run_dir)
 
     return build_envelope(
@@ -233,4 +280,5 @@ async def hubspot_snapshot_diff(
         run_result=result,
         summary="Snapshot comparison" if result.ok else "Snapshot diff failed",
         safety=Safety(impact="analyze"),
+        passthrough_json=True,
     )
@@ -10,7 +10,8 @@ AND plan_hash matching the dry-run output (two-phase confirmation).
 
 from __future__ import annotations
 
-import json
+import functools
+import os
 from pathlib import Path
 from typing import Any
 
@@ -18,17 +19,36 @@ from g_gremlin_hubspot_mcp.artifacts import (
     cleanup_run_dir,
     create_temp_dir,
     file_metadata,
+    parse_json_bytes,
     temp_file_path,
 )
 from g_gremlin_hubspot_mcp.envelope import (
     Safety,
     build_envelope,
+    compute_bytes_hash,
+    compute_file_hash,
     compute_plan_hash,
     error_envelope,
 )
 from g_gremlin_hubspot_mcp.runner import run_gremlin
 
 
+@functools.lru_cache(maxsize=64)
+def _hash_plan_file(path: str, mtime_ns: int, size: int, inode: int) -> str:
+    return compute_file_hash(Path(path))
+
+
+def _cached_plan_file_hash(plan_path: Path) -> str:
+    """Byte hash of a plan file, memoized on (path, mtime, size, inode).
+
+    Only used for dry-run reviews. Apply verification always re-hashes, so
+    an edit the stat key misses (same size, within mtime granularity) can at
+    worst report a stale review hash that then fails verification.
+    """
+    st = os.stat(plan_path)
+    return _hash_plan_file(str(plan_path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
 async def hubspot_objects_upsert(
     object_type: str,
     csv_path: str,
@@ -137,23 +157,29 @@ async def hubspot_dedupe_apply(
 
     # Verify plan_hash matches the actual plan file
     if apply and plan_hash:
-        plan_path = Path(plan_file)
-        if plan_path.exists():
-            try:
-                plan_data = json.loads(plan_path.read_text(encoding="utf-8"))
-                actual_hash = compute_plan_hash(plan_data)
-                if actual_hash != plan_hash:
-                    return error_envelope(
-                        f"plan_hash mismatch: expected {plan_hash}, "
-                        f"but plan file hashes to {actual_hash}. "
-                        "The plan may have changed since dry-run. Re-run hubspot.dedupe.plan.",
-                        safety=Safety(dry_run=False, requires_apply=True, impact="merge"),
-                    )
-            except (json.JSONDecodeError, OSError) as exc:
+        try:
+            # One read; both hash checks below work from these bytes
+            plan_bytes = Path(plan_file).read_bytes()
+            actual_hash = compute_bytes_hash(plan_bytes)
+            # Inline plans were hashed canonically over the parsed JSON
+            # (the file on disk may be a re-serialized copy of it).
+            if (
+                actual_hash != plan_hash
+                and compute_plan_hash(parse_json_bytes(plan_bytes)) != plan_hash
+            ):
                 return error_envelope(
-                    f"Cannot read/verify plan file: {exc}",
+                    f"plan_hash mismatch: expected {plan_hash}, "
+                    f"but plan file hashes to {actual_hash}. "
+                    "The plan may have changed since dry-run. Re-run hubspot.dedupe.plan.",
                     safety=Safety(dry_run=False, requires_apply=True, impact="merge"),
                 )
+        except FileNotFoundError:
+            pass  # nothing to verify; the CLI reports the missing plan
+        except (ValueError, OSError) as exc:
+            return error_envelope(
+                f"Cannot read/verify plan file: {exc}",
+                safety=Safety(dry_run=False, requires_apply=True, impact="merge"),
+            )
 
     args = [
         "hubspot", "merge-apply-plan", plan_file,
@@ -173,13 +199,10 @@ async def hubspot_dedupe_apply(
     # For dry-run, include the plan hash
     review_hash = ""
     if is_dry_run and result.ok:
-        plan_path = Path(plan_file)
-        if plan_path.exists():
-            try:
-                plan_data = json.loads(plan_path.read_text(encoding="utf-8"))
-                review_hash = compute_plan_hash(plan_data)
-            except (json.JSONDecodeError, OSError):
-                pass
+        try:
+            review_hash = _cached_plan_file_hash(Path(plan_file))
+        except OSError:
+            pass
 
     summary = (
         f"{'Dry-run: ' if is_dry_run else ''}Merge apply"
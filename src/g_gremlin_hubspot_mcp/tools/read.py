@@ -13,8 +13,8 @@ Tools:
 
 from __future__ import annotations
 
-import csv
-import json
+import asyncio
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
@@ -30,14 +30,29 @@ from g_gremlin_hubspot_mcp.envelope import Safety, build_envelope
 from g_gremlin_hubspot_mcp.runner import RunResult, run_gremlin
 
 
+# Fixed CLI arguments, built once. run_gremlin never mutates args.
+_WHOAMI_ARGS = ("hubspot", "whoami", "--json")
+_DOCTOR_ARGS = ("hubspot", "doctor", "--json")
+_SCHEMA_LS_ARGS = ("hubspot", "schema", "ls", "--json")
+_SCHEMA_SYNC_ARGS = ("hubspot", "schema", "sync", "--json")
+_SCHEMA_SHOW_PREFIX = ("hubspot", "schema", "show")
+_PROPS_LIST_PREFIX = ("hubspot", "props", "list")
+_QUERY_PREFIX = ("hubspot", "query")
+
+_SCHEMA_CACHE_MISS = "no cached schema found"
+
+
 def _is_schema_cache_miss(result: RunResult) -> bool:
     """Detect first-run schema cache misses from CLI output."""
-    text = f"{result.stderr}\n{result.stdout}".lower()
-    return "no cached schema found" in text
+    # stderr is small (capped by the runner) and is where the CLI reports it
+    return (
+        _SCHEMA_CACHE_MISS in result.stderr.lower()
+        or _SCHEMA_CACHE_MISS in result.stdout.lower()
+    )
 
 
 async def _run_schema_with_auto_sync(
-    args: list[str],
+    args: Sequence[str],
     *,
     tool_name: str,
 ) -> tuple[RunResult, bool]:
@@ -47,7 +62,7 @@ async def _run_schema_with_auto_sync(
         return result, False
 
     sync_result = await run_gremlin(
-        ["hubspot", "schema", "sync", "--json"],
+        _SCHEMA_SYNC_ARGS,
         tool_name="schema.list",
     )
     if not sync_result.ok:
@@ -64,13 +79,14 @@ async def hubspot_auth_whoami() -> str:
     Use this to verify that the MCP server can reach HubSpot.
     """
     result = await run_gremlin(
-        ["hubspot", "whoami", "--json"],
+        _WHOAMI_ARGS,
         tool_name="whoami",
     )
     return build_envelope(
         run_result=result,
         summary="HubSpot auth check" if result.ok else "HubSpot auth check failed",
         safety=Safety(impact="read"),
+        passthrough_json=True,
     )
 
 
@@ -81,13 +97,14 @@ async def hubspot_auth_doctor() -> str:
     Returns a structured health report with pass/fail checks.
     """
     result = await run_gremlin(
-        ["hubspot", "doctor", "--json"],
+        _DOCTOR_ARGS,
         tool_name="doctor",
     )
     return build_envelope(
         run_result=result,
         summary="HubSpot diagnostics" if result.ok else "HubSpot diagnostics failed",
         safety=Safety(impact="read"),
+        passthrough_json=True,
     )
 
 
@@ -97,7 +114,7 @@ async def hubspot_schema_list() -> str:
     Returns object type names, labels, and whether they are standard or custom.
     """
     result, auto_synced = await _run_schema_with_auto_sync(
-        ["hubspot", "schema", "ls", "--json"],
+        _SCHEMA_LS_ARGS,
         tool_name="schema.list",
     )
     summary = "Listed CRM object types"
@@ -107,6 +124,7 @@ async def hubspot_schema_list() -> str:
         run_result=result,
         summary=summary if result.ok else "Schema list failed",
         safety=Safety(impact="read"),
+        passthrough_json=True,
     )
 
 
@@ -119,7 +137,7 @@ async def hubspot_schema_get(object_type: str) -> str:
     Returns properties, associations, and metadata for the object type.
     """
     result, auto_synced = await _run_schema_with_auto_sync(
-        ["hubspot", "schema", "show", object_type, "--json"],
+        [*_SCHEMA_SHOW_PREFIX, object_type, "--json"],
         tool_name="schema.get",
     )
     summary = f"Schema for {object_type}"
@@ -129,22 +147,40 @@ async def hubspot_schema_get(object_type: str) -> str:
         run_result=result,
         summary=summary if result.ok else f"Schema get failed for {object_type}",
         safety=Safety(impact="read"),
+        passthrough_json=True,
     )
 
 
+def _join_object_types(object_types: str | list[str]) -> str:
+    """Normalize object types to one comma-separated, de-duplicated argument."""
+    if isinstance(object_types, str):
+        object_types = [object_types]
+    seen: dict[str, None] = {}
+    for entry in object_types:
+        for name in entry.split(","):
+            name = name.strip()
+            if name:
+                seen.setdefault(name, None)
+    return ",".join(seen)
+
+
 async def hubspot_props_list(
-    object_types: str,
+    object_types: str | list[str],
     match: str | None = None,
 ) -> str:
     """[READ] List properties for one or more HubSpot CRM object types.
 
+    All requested types are fetched by a single g-gremlin invocation, so ask
+    for every type you need in one call rather than one call per type.
+
     Args:
-        object_types: Comma-separated object types (e.g., "contacts", "contacts,companies").
+        object_types: Comma-separated object types or a list (e.g., "contacts,companies" or ["contacts", "companies"]).
         match: Optional filter string to match property names/labels.
 
     Returns property names, types, labels, and group assignments.
     """
-    args = ["hubspot", "props", "list", object_types, "--json"]
+    object_types = _join_object_types(object_types)
+    args = [*_PROPS_LIST_PREFIX, object_types, "--json"]
     if match:
         args.extend(["--match", match])
 
@@ -153,6 +189,7 @@ async def hubspot_props_list(
         run_result=result,
         summary=f"Properties for {object_types}" if result.ok else "Props list failed",
         safety=Safety(impact="read"),
+        passthrough_json=True,
     )
 
 
@@ -172,7 +209,7 @@ async def hubspot_objects_query(
         properties: Comma-separated properties to include in results.
         limit: Max records to return (default 100, max 10000).
     """
-    args = ["hubspot", "query", object_type, "--json"]
+    args = [*_QUERY_PREFIX, object_type, "--json"]
     if where:
         for clause in where:
             args.extend(["--where", clause])
@@ -186,6 +223,7 @@ async def hubspot_objects_query(
         run_result=result,
         summary=f"Query {object_type}" if result.ok else f"Query failed for {object_type}",
         safety=Safety(impact="read"),
+        passthrough_json=True,
     )
 
 
@@ -235,22 +273,26 @@ async def hubspot_objects_pull(
     artifact = None
     extra_data: dict[str, Any] = {}
 
-    if result.ok and output_path.exists():
-        meta = read_csv_metadata(output_path)
-
+    if result.ok:
         if should_inline(output_path):
-            # Small file — inline the data
+            # Small file — inline the data. One DictReader pass yields both
+            # the rows and the header, so the file is not scanned twice.
             try:
-                rows: list[dict[str, Any]] = []
-                with output_path.open("r", encoding="utf-8") as f:
+                import csv  # only needed for inline pulls
+
+                with output_path.open("r", encoding="utf-8", newline="") as f:
                     reader = csv.DictReader(f)
-                    for row in reader:
-                        rows.append(dict(row))
+                    # DictReader already yields a fresh dict per row
+                    rows: list[dict[str, Any]] = list(reader)
+                    columns = [c.strip() for c in reader.fieldnames or [] if c.strip()]
                 extra_data["records"] = rows
                 extra_data["count"] = len(rows)
-                extra_data["columns"] = meta.get("columns", [])
+                extra_data["columns"] = columns
                 cleanup_run_dir(run_dir)
+            except FileNotFoundError:
+                pass  # the CLI wrote no output file
             except Exception:
+                meta = read_csv_metadata(output_path)
                 artifact = Artifact(
                     path=str(output_path),
                     row_count=meta.get("row_count", 0),
@@ -259,13 +301,14 @@ async def hubspot_objects_pull(
                 )
         else:
             # Large file — artifact reference
+            meta = read_csv_metadata(output_path)
             artifact = Artifact(
                 path=str(output_path),
                 row_count=meta.get("row_count", 0),
                 columns=meta.get("columns", []),
                 size_bytes=meta.get("size_bytes", 0),
             )
-    elif not result.ok:
+    else:
         cleanup_run_dir(run_dir)
 
     return build_envelope(
@@ -320,12 +363,13 @@ async def hubspot_engagements_pull(
         timeout=timeout_seconds,
     )
 
-    # List output files
+    # List output files (one row-count scan per type, run concurrently)
     artifact_files: list[dict[str, Any]] = []
-    if result.ok and output_dir.exists():
-        for csv_file in output_dir.glob("*.csv"):
-            meta = read_csv_metadata(csv_file)
-            artifact_files.append(meta)
+    if result.ok:  # output_dir was created above
+        artifact_files = list(await asyncio.gather(*(
+            asyncio.to_thread(read_csv_metadata, csv_file)
+            for csv_file in output_dir.glob("*.csv")
+        )))
 
     extra_data: dict[str, Any] = {}
     if artifact_files:
@@ -4,15 +4,40 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from typing import Any
+from unittest.mock import AsyncMock
 
 import pytest
 
 from g_gremlin_hubspot_mcp.runner import RunResult
+from g_gremlin_hubspot_mcp.tools import analyze as tools_analyze
+from g_gremlin_hubspot_mcp.tools import mutate as tools_mutate
+from g_gremlin_hubspot_mcp.tools import read as tools_read
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
 
 GOLDEN_DIR = Path(__file__).parent / "golden"
 
 
+# JSON helpers for tests: orjson when available, stdlib otherwise. orjson
+# turns integers wider than 64 bits into floats, so tests asserting on those
+# use json directly.
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(obj: Any, *, indent: bool = False) -> str:
+        """orjson.dumps as str (orjson returns bytes)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+else:  # pragma: no cover - exercised when orjson is absent
+    loads = json.loads
+
+    def dumps(obj: Any, *, indent: bool = False) -> str:
+        return json.dumps(obj, indent=2 if indent else None)
+
+
 def golden_stdout(name: str) -> str:
     """Load golden stdout fixture."""
     path = GOLDEN_DIR / f"{name}.json"
@@ -25,6 +50,13 @@ def golden_stdout(name: str) -> str:
     raise FileNotFoundError(f"No golden fixture for {name}")
 
 
+@pytest.fixture(scope="session")
+def goldens() -> dict[str, str]:
+    """Every golden stdout fixture by name, read from disk once per session."""
+    names = {path.stem for path in GOLDEN_DIR.iterdir() if path.suffix in (".json", ".txt")}
+    return {name: golden_stdout(name) for name in sorted(names)}
+
+
 def make_run_result(
     stdout: str = "",
     stderr: str = "",
@@ -43,16 +75,12 @@ def error_result(stderr: str = "Error: something went wrong", exit_code: int = 1
 
 
 @pytest.fixture
-def mock_run_gremlin():
-    """Patch run_gremlin to return controlled RunResults."""
-    with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock_read, \
-         patch("g_gremlin_hubspot_mcp.tools.analyze.run_gremlin", new_callable=AsyncMock) as mock_analyze, \
-         patch("g_gremlin_hubspot_mcp.tools.mutate.run_gremlin", new_callable=AsyncMock) as mock_mutate:
-        yield {
-            "read": mock_read,
-            "analyze": mock_analyze,
-            "mutate": mock_mutate,
-        }
+def mock_run_gremlin(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """One AsyncMock standing in for run_gremlin in every tool module."""
+    mock = AsyncMock()
+    for module in (tools_read, tools_analyze, tools_mutate):
+        monkeypatch.setattr(module, "run_gremlin", mock)
+    return mock
 
 
 @pytest.fixture
@@ -77,5 +105,5 @@ def tmp_plan(tmp_path: Path) -> Path:
             }
         ],
     }
-    plan_path.write_text(json.dumps(plan), encoding="utf-8")
+    plan_path.write_text(dumps(plan), encoding="utf-8")
     return plan_path
@@ -0,0 +1,185 @@
+"""Tests for artifacts.py — CSV metadata, JSON loading and inline decisions."""
+
+from __future__ import annotations
+
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from g_gremlin_hubspot_mcp import artifacts as artifacts_mod
+from g_gremlin_hubspot_mcp.artifacts import (
+    cleanup_run_dir,
+    create_temp_dir,
+    file_metadata,
+    read_csv_metadata,
+    read_json_file,
+    should_inline,
+)
+
+
+class TestReadCsvMetadata:
+    def test_columns_and_row_count(self, tmp_csv: Path):
+        meta = read_csv_metadata(tmp_csv)
+        assert meta["columns"] == ["id", "email", "firstname"]
+        assert meta["row_count"] == 2
+
+    def test_counts_last_row_without_trailing_newline(self, tmp_path: Path):
+        csv_path = tmp_path / "no_newline.csv"
+        csv_path.write_bytes(b"id,email\n1,a@b.com\n2,c@d.com")
+        assert read_csv_metadata(csv_path)["row_count"] == 2
+
+    def test_bare_carriage_return_line_ends(self, tmp_path: Path):
+        csv_path = tmp_path / "cr.csv"
+        csv_path.write_bytes(b"id,x\r1,a\r2,b\r")
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == ["id", "x"]
+        assert meta["row_count"] == 2
+
+    def test_crlf_split_across_reads(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(artifacts_mod, "CSV_HEADER_PROBE_BYTES", 5)
+        monkeypatch.setattr(artifacts_mod, "CSV_SCAN_CHUNK_BYTES", 5)
+        csv_path = tmp_path / "crlf.csv"
+        csv_path.write_bytes(b"id,x\r\n1,a\r\n2,b\r\n3,c")
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == ["id", "x"]
+        assert meta["row_count"] == 3
+
+    def test_header_only(self, tmp_path: Path):
+        csv_path = tmp_path / "header.csv"
+        csv_path.write_bytes(b"id,email\n")
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == ["id", "email"]
+        assert meta["row_count"] == 0
+
+    def test_header_longer_than_probe(self, tmp_path: Path):
+        columns = [f"property_{i:04d}" for i in range(600)]
+        csv_path = tmp_path / "wide.csv"
+        csv_path.write_bytes((",".join(columns) + "\n" + ",".join("x" * 600) + "\n").encode())
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == columns
+        assert meta["row_count"] == 1
+
+    def test_quoted_fields_with_newlines(self, tmp_path: Path):
+        csv_path = tmp_path / "quoted.csv"
+        csv_path.write_bytes(b'id,"notes, long"\n1,"line one\nline two"\n2,plain\n')
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == ["id", "notes, long"]
+        assert meta["row_count"] == 2
+
+    def test_quote_after_first_chunk(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(artifacts_mod, "CSV_SCAN_CHUNK_BYTES", 16)
+        csv_path = tmp_path / "late_quote.csv"
+        body = b"".join(b"%d,x\n" % i for i in range(2000))
+        csv_path.write_bytes(b"id,v\n" + body + b'9999,"a\nb"\n')
+        assert read_csv_metadata(csv_path)["row_count"] == 2001
+
+    def test_quoted_fields_skip_csv_fallback(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(artifacts_mod, "CSV_HEADER_PROBE_BYTES", 3)
+        monkeypatch.setattr(artifacts_mod, "CSV_SCAN_CHUNK_BYTES", 3)
+        monkeypatch.setattr(artifacts_mod, "_parse_csv_metadata", None)
+        csv_path = tmp_path / "quoted_chunks.csv"
+        csv_path.write_bytes(b'"id","note"\r\n"1","say ""hi""\nbye"\r\n"2",""\r\n')
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == ["id", "note"]
+        assert meta["row_count"] == 2
+
+    def test_quoted_fields_with_bare_carriage_returns(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(artifacts_mod, "_parse_csv_metadata", None)
+        csv_path = tmp_path / "quoted_cr.csv"
+        csv_path.write_bytes(b'id,note\r1,"x\ry"\r2,z\r')
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == ["id", "note"]
+        assert meta["row_count"] == 2
+
+    def test_stray_quote_falls_back_to_csv_module(self, tmp_path: Path):
+        csv_path = tmp_path / "stray.csv"
+        csv_path.write_bytes(b'id,size\n1,5" screen\n2,x\n')
+        meta = read_csv_metadata(csv_path)
+        assert meta["columns"] == ["id", "size"]
+        assert meta["row_count"] == 2
+
+    def test_missing_file(self, tmp_path: Path):
+        meta = read_csv_metadata(tmp_path / "missing.csv")
+        assert meta["columns"] == []
+        assert meta["row_count"] == 0
+
+
+class TestStatCache:
+    def test_inline_and_metadata_share_one_stat(self, tmp_path: Path):
+        run_dir = tmp_path / "run"
+        run_dir.mkdir()
+        csv_path = run_dir / "out.csv"
+        csv_path.write_bytes(b"id\n1\n")
+
+        assert should_inline(csv_path) is True
+        assert str(csv_path) in artifacts_mod._stat_cache
+        assert file_metadata(csv_path)["size_bytes"] == 5
+
+        cleanup_run_dir(run_dir)
+        assert str(csv_path) not in artifacts_mod._stat_cache
+        assert not run_dir.exists()
+
+    def test_eviction_is_thread_safe(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(artifacts_mod, "_stat_cache", {})
+        paths = []
+        for i in range(artifacts_mod._STAT_CACHE_MAX * 4):
+            path = tmp_path / f"{i}.csv"
+            path.write_bytes(b"id\n")
+            paths.append(path)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            sizes = list(pool.map(lambda p: file_metadata(p)["size_bytes"], paths))
+
+        assert sizes == [3] * len(paths)
+        assert len(artifacts_mod._stat_cache) <= artifacts_mod._STAT_CACHE_MAX
+
+
+class TestReadJsonFile:
+    @pytest.mark.parametrize("parser", ["simdjson", "orjson", "json"])
+    def test_parses_plan(self, tmp_path: Path, monkeypatch, parser: str):
+        if getattr(artifacts_mod, parser, True) is None:
+            pytest.skip(f"{parser} not installed")
+        if parser != "simdjson":
+            monkeypatch.setattr(artifacts_mod, "simdjson", None)
+        if parser == "json":
+            monkeypatch.setattr(artifacts_mod, "orjson", None)
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_text('{"groups": [{"primary": "1", "ids": [1, 2]}], "big": 123456789012345678901234}')
+        data = read_json_file(plan_path)
+        assert data == {"groups": [{"primary": "1", "ids": [1, 2]}], "big": 123456789012345678901234}
+        assert type(data) is dict
+
+    def test_invalid_json_raises_value_error(self, tmp_path: Path):
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_text("{not json")
+        with pytest.raises(ValueError):
+            read_json_file(plan_path)
+
+    def test_parser_reused_across_calls(self, tmp_path: Path):
+        if artifacts_mod.simdjson is None:
+            pytest.skip("simdjson not installed")
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_text('{"groups": [{"primary": "1"}]}')
+        first = read_json_file(plan_path)
+        parser = artifacts_mod.simdjson_parser()
+        assert read_json_file(plan_path) == first
+        assert artifacts_mod.simdjson_parser() is parser
+
+
+class TestCreateTempDir:
+    def test_unique_dirs_under_artifact_dir(self, tmp_path: Path, monkeypatch):
+        base = tmp_path / "artifacts"
+        monkeypatch.setenv("GREMLIN_MCP_ARTIFACT_DIR", str(base))
+        first, second = create_temp_dir(), create_temp_dir()
+        assert first != second
+        assert first.parent == base and second.parent == base
+        assert first.is_dir() and second.is_dir()
+
+    def test_recreates_removed_artifact_dir(self, tmp_path: Path, monkeypatch):
+        base = tmp_path / "artifacts"
+        monkeypatch.setenv("GREMLIN_MCP_ARTIFACT_DIR", str(base))
+        create_temp_dir()
+        shutil.rmtree(base)
+        assert create_temp_dir().parent == base
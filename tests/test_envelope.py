@@ -2,135 +2,245 @@
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import json
+import string
+from pathlib import Path
+from typing import Any
 
 import pytest
 
+from g_gremlin_hubspot_mcp import envelope as envelope_mod
 from g_gremlin_hubspot_mcp.envelope import (
     Artifact,
     Safety,
     Warning,
     build_envelope,
+    compute_bytes_hash,
+    compute_file_hash,
     compute_plan_hash,
     error_envelope,
 )
-from g_gremlin_hubspot_mcp.runner import RunResult
 
+from conftest import (
+    dumps as json_dumps,
+    loads as json_loads,
+    error_result,
+    make_run_result,
+    success_result,
+)
 
-class TestComputePlanHash:
-    def test_deterministic(self):
-        data = {"groups": [{"key": "a@b.com", "primary": "1"}]}
-        h1 = compute_plan_hash(data)
-        h2 = compute_plan_hash(data)
-        assert h1 == h2
 
-    def test_starts_with_sha256(self):
+class TestComputePlanHash:
+    @pytest.mark.parametrize("a,b,should_equal", [
+        # deterministic
+        ({"groups": [{"key": "a@b.com", "primary": "1"}]}, {"groups": [{"key": "a@b.com", "primary": "1"}]}, True),
+        # different data, different hash
+        ({"a": 1}, {"a": 2}, False),
+        # key order independent (sort_keys=True)
+        ({"a": 1, "b": 2}, {"b": 2, "a": 1}, True),
+    ])
+    def test_hash_equality(self, a, b, should_equal: bool):
+        assert (compute_plan_hash(a) == compute_plan_hash(b)) is should_equal
+
+    def test_sha256_base64url_format(self):
         h = compute_plan_hash({"test": True})
         assert h.startswith("sha256:")
-
-    def test_different_data_different_hash(self):
-        h1 = compute_plan_hash({"a": 1})
-        h2 = compute_plan_hash({"a": 2})
-        assert h1 != h2
-
-    def test_key_order_independent(self):
-        h1 = compute_plan_hash({"a": 1, "b": 2})
-        h2 = compute_plan_hash({"b": 2, "a": 1})
-        assert h1 == h2  # sort_keys=True makes this work
+        digest = h.removeprefix("sha256:")
+        assert len(digest) == 43
+        assert set(digest) <= set(string.ascii_letters + string.digits + "-_")
+
+    def test_non_ascii_plan_matches_baseline_digest(self):
+        # The digest of json.dumps(plan, sort_keys=True, separators=(",", ":")),
+        # which escapes non-ASCII; a dry-run from an earlier release must verify.
+        data = {"groups": [{"key": "zoë@example.com", "primary": "1", "name": "René"}]}
+        assert compute_plan_hash(data) == "sha256:8M80jNHjNu8f3n-43wtRmuUDVasXQGeQVYfxAtg9IJc"
+
+    def test_streamed_encoding_matches_one_shot(self):
+        groups = [{"key": f"zoë{i}@example.com", "primary": str(i), "score": 1e16}
+                  for i in range(envelope_mod._HASH_LIST_BATCH * 2 + 1)]
+        data = {"object_type": "contacts", "groups": groups, "meta": {"b": [], "a": {}}}
+        streamed = "".join(envelope_mod._canonical_chunks(data))
+        assert streamed == json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+class TestComputeFileHash:
+    @pytest.mark.parametrize("size", [0, 10, envelope_mod._FILE_HASH_CHUNK_BYTES * 3 + 7])
+    def test_matches_sha256_of_bytes(self, tmp_path: Path, size: int):
+        data = bytes(i % 251 for i in range(size))
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_bytes(data)
+        expected = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+        assert compute_file_hash(plan_path) == f"sha256:{expected}"
+        assert compute_bytes_hash(data) == compute_file_hash(plan_path)
+
+
+def _dig(obj: Any, path: str) -> Any:
+    """Follow a dotted path ("artifact.path", "items.0.name") into parsed JSON."""
+    for key in path.split("."):
+        obj = obj[int(key)] if isinstance(obj, list) else obj[key]
+    return obj
+
+
+_OK = success_result('{}')
+
+# Agentic CLI output, serialized once at import.
+_AGENTIC_STDOUT = json_dumps({
+    "$schema": "AgenticResult/v1",
+    "command": "test",
+    "status": "success",
+    "result": {"count": 42},
+})
+_AGENTIC_AFTER_LOGS_STDOUT = "Scanning...\nDone.\n" + json_dumps({
+    "$schema": "AgenticResult/v1",
+    "command": "test",
+    "status": "success",
+    "result": {"groups": [{"key": "a"}, {"key": "b"}]},
+}, indent=True) + "\n"
+
+# (build_envelope kwargs, {dotted path: expected value})
+_ENVELOPE_SHAPE_CASES = [
+    pytest.param(
+        {"run_result": success_result('{"ok": true}'), "summary": "test"},
+        {"$schema": "GremlinMCPResponse/v1", "ok": True},
+        id="schema-and-ok",
+    ),
+    pytest.param(
+        {"run_result": error_result("Error")},
+        {"ok": False},
+        id="ok-false-on-failure",
+    ),
+    pytest.param(
+        {"run_result": _OK, "summary": "Pulled 100 contacts"},
+        {"summary": "Pulled 100 contacts"},
+        id="summary",
+    ),
+    pytest.param(
+        {"run_result": _OK, "artifact": Artifact(path="/tmp/test.csv", row_count=100, columns=["id", "email"])},
+        {"artifact.path": "/tmp/test.csv", "artifact.row_count": 100},
+        id="artifact",
+    ),
+    pytest.param(
+        {"run_result": _OK},
+        {"safety.impact": "read", "safety.dry_run": False},
+        id="safety-defaults-to-read",
+    ),
+    pytest.param(
+        {"run_result": _OK, "safety": Safety(dry_run=True, requires_apply=True, impact="merge", plan_hash="sha256:abc")},
+        {"safety.plan_hash": "sha256:abc", "safety.dry_run": True},
+        id="safety-with-plan-hash",
+    ),
+    pytest.param(
+        {"run_result": make_run_result(stdout='{"test": 1}', stderr="warn")},
+        {"raw.exit_code": 0, "raw.stderr": "warn"},
+        id="raw",
+    ),
+    pytest.param(
+        {"run_result": _OK, "extra_warnings": [Warning(code="TEST_WARN", message="test warning")]},
+        {"warnings": [{"code": "TEST_WARN", "message": "test warning", "severity": "warning"}]},
+        id="warnings",
+    ),
+]
 
 
 class TestBuildEnvelope:
-    def test_schema_present(self):
-        result = RunResult(stdout='{"ok": true}', stderr="", exit_code=0)
-        raw = build_envelope(run_result=result, summary="test")
-        parsed = json.loads(raw)
-        assert parsed["$schema"] == "GremlinMCPResponse/v1"
-
-    def test_ok_true_on_success(self):
-        result = RunResult(stdout='{"ok": true}', stderr="", exit_code=0)
-        raw = build_envelope(run_result=result)
-        parsed = json.loads(raw)
-        assert parsed["ok"] is True
-
-    def test_ok_false_on_failure(self):
-        result = RunResult(stdout="", stderr="Error", exit_code=1)
-        raw = build_envelope(run_result=result)
-        parsed = json.loads(raw)
-        assert parsed["ok"] is False
-
-    def test_summary_included(self):
-        result = RunResult(stdout='{}', stderr="", exit_code=0)
-        raw = build_envelope(run_result=result, summary="Pulled 100 contacts")
-        parsed = json.loads(raw)
-        assert parsed["summary"] == "Pulled 100 contacts"
-
-    def test_artifact_included_when_provided(self):
-        result = RunResult(stdout='{}', stderr="", exit_code=0)
-        art = Artifact(path="/tmp/test.csv", row_count=100, columns=["id", "email"])
-        raw = build_envelope(run_result=result, artifact=art)
-        parsed = json.loads(raw)
-        assert parsed["artifact"]["path"] == "/tmp/test.csv"
-        assert parsed["artifact"]["row_count"] == 100
-
-    def test_safety_defaults_to_read(self):
-        result = RunResult(stdout='{}', stderr="", exit_code=0)
-        raw = build_envelope(run_result=result)
-        parsed = json.loads(raw)
-        assert parsed["safety"]["impact"] == "read"
-        assert parsed["safety"]["dry_run"] is False
-
-    def test_safety_with_plan_hash(self):
-        result = RunResult(stdout='{}', stderr="", exit_code=0)
-        safety = Safety(dry_run=True, requires_apply=True, impact="merge", plan_hash="sha256:abc")
-        raw = build_envelope(run_result=result, safety=safety)
-        parsed = json.loads(raw)
-        assert parsed["safety"]["plan_hash"] == "sha256:abc"
-        assert parsed["safety"]["dry_run"] is True
-
-    def test_raw_included(self):
-        result = RunResult(stdout='{"test": 1}', stderr="warn", exit_code=0)
-        raw = build_envelope(run_result=result)
-        parsed = json.loads(raw)
-        assert parsed["raw"]["exit_code"] == 0
-        assert "warn" in parsed["raw"]["stderr"]
-
-    def test_warnings_surfaced(self):
-        result = RunResult(stdout='{}', stderr="", exit_code=0)
-        warns = [Warning(code="TEST_WARN", message="test warning")]
-        raw = build_envelope(run_result=result, extra_warnings=warns)
-        parsed = json.loads(raw)
-        assert len(parsed["warnings"]) == 1
-        assert parsed["warnings"][0]["code"] == "TEST_WARN"
+    @pytest.mark.parametrize("kwargs,expected", _ENVELOPE_SHAPE_CASES)
+    def test_envelope_shape(self, kwargs: dict[str, Any], expected: dict[str, Any]):
+        parsed = json_loads(build_envelope(**kwargs))
+        for path, value in expected.items():
+            assert _dig(parsed, path) == value, path
 
     def test_meta_includes_version(self):
-        result = RunResult(stdout='{}', stderr="", exit_code=0)
-        raw = build_envelope(run_result=result)
-        parsed = json.loads(raw)
+        parsed = json_loads(build_envelope(run_result=_OK))
         assert "requires_g_gremlin" in parsed["meta"]
         assert "timestamp" in parsed["meta"]
 
     def test_agentic_result_extracted(self):
-        agentic = json.dumps({
-            "$schema": "AgenticResult/v1",
-            "command": "test",
-            "status": "success",
-            "result": {"count": 42},
-        })
-        result = RunResult(stdout=agentic, stderr="", exit_code=0)
-        raw = build_envelope(run_result=result)
-        parsed = json.loads(raw)
+        raw = build_envelope(run_result=success_result(_AGENTIC_STDOUT))
+        parsed = json_loads(raw)
         assert parsed["data"]["count"] == 42
         assert parsed["raw"]["agentic_result"]["$schema"] == "AgenticResult/v1"
 
+    def test_agentic_result_after_log_lines(self):
+        parsed = json_loads(build_envelope(run_result=success_result(_AGENTIC_AFTER_LOGS_STDOUT)))
+        assert parsed["data"]["groups"] == [{"key": "a"}, {"key": "b"}]
+
+    def test_json_output_after_prefix_lines(self):
+        result = success_result('Fetching schema...\n[\n  {"name": "contacts"}\n]\n')
+        parsed = json_loads(build_envelope(run_result=result))
+        assert parsed["data"]["items"] == [{"name": "contacts"}]
+
+    @pytest.mark.parametrize("stdout,items", [
+        ("123", 123),
+        ("true\n", True),
+        ('"done"', "done"),
+        ("-1.5", -1.5),
+    ])
+    def test_scalar_json_output(self, stdout: str, items: Any):
+        parsed = json_loads(build_envelope(run_result=success_result(stdout)))
+        assert parsed["data"] == {"items": items}
+
+    def test_wide_integers_survive_serialization(self):
+        result = success_result('[123456789012345678901234567890]')
+        parsed = json.loads(build_envelope(run_result=result))  # exact big ints
+        assert parsed["data"]["items"] == [123456789012345678901234567890]
+
+
+class TestPassthroughJson:
+    def _both(self, stdout: str, **kwargs) -> tuple[dict, dict]:
+        result = success_result(stdout)
+        # json, not json_loads: one case carries an integer wider than 64 bits
+        plain = json.loads(build_envelope(run_result=result, summary="s", **kwargs))
+        spliced = json.loads(build_envelope(run_result=result, summary="s", passthrough_json=True, **kwargs))
+        for parsed in (plain, spliced):
+            parsed["meta"].pop("timestamp")
+        return plain, spliced
+
+    @pytest.mark.parametrize("use_simdjson", [True, False])
+    def test_same_envelope_as_decode_path(self, monkeypatch, use_simdjson: bool):
+        if not use_simdjson:
+            monkeypatch.setattr(envelope_mod, "simdjson", None)
+        stdout = '\n{"hub_id": 1, "summary": "x \\"data\\": \\"y\\"", "nested": {"data": [1, 2.5, null]}}\n'
+        plain, spliced = self._both(stdout)
+        assert spliced == plain
+        assert spliced["data"]["hub_id"] == 1
+
+    @pytest.mark.parametrize("stdout", [
+        "[1, 2]",
+        "{}",
+        "{ \n }",
+        "not json",
+        '{"truncated": ',
+        '{"a": 1}\n{"b": 2}',
+        '{"n": 123456789012345678901234}',
+        json_dumps({"$schema": "AgenticResult/v1", "status": "ok", "result": {"x": 1}}),
+    ])
+    def test_falls_back_for_other_output(self, stdout: str):
+        plain, spliced = self._both(stdout)
+        assert spliced == plain
+
+    def test_data_emitted_last_whatever_the_summary_says(self):
+        summary = '"data": "__gremlin_mcp_raw_data__"'
+        raw = build_envelope(run_result=success_result('{"a": 1}'), summary=summary, passthrough_json=True)
+        parsed = json.loads(raw)
+        assert parsed["summary"] == summary
+        assert parsed["data"] == {"a": 1}
+        assert list(parsed)[-1] == "data"
+
+    def test_extra_data_disables_passthrough(self):
+        plain, spliced = self._both('{"a": 1}', extra_data={"b": 2})
+        assert spliced == plain
+        assert spliced["data"] == {"a": 1, "b": 2}
+
 
 class TestErrorEnvelope:
+    # Smoke checks on the serialized text; TestBuildEnvelope covers the parsed shape.
     def test_error_envelope_ok_false(self):
         raw = error_envelope("Something failed")
-        parsed = json.loads(raw)
-        assert parsed["ok"] is False
-        assert parsed["summary"] == "Something failed"
+        assert '"ok": false' in raw
+        assert '"summary": "Something failed"' in raw
 
     def test_error_envelope_has_schema(self):
         raw = error_envelope("fail")
-        parsed = json.loads(raw)
-        assert parsed["$schema"] == "GremlinMCPResponse/v1"
+        assert '"$schema": "GremlinMCPResponse/v1"' in raw
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch, MagicMock
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -15,6 +17,8 @@ from g_gremlin_hubspot_mcp.runner import (
     run_gremlin,
 )
 
+from conftest import success_result
+
 
 class TestRunResult:
     def test_ok_on_zero_exit(self):
@@ -27,94 +31,166 @@ class TestRunResult:
 
 
 class TestTimeouts:
-    def test_whoami_timeout_is_30s(self):
-        assert TIMEOUTS["whoami"] == 30
-
-    def test_pull_timeout_is_15min(self):
-        assert TIMEOUTS["objects.pull"] == 900
-
-    def test_snapshot_timeout_is_10min(self):
-        assert TIMEOUTS["snapshot.create"] == 600
+    @pytest.mark.parametrize("tool_name,expected", [
+        ("whoami", 30),
+        ("objects.pull", 900),
+        ("snapshot.create", 600),
+    ])
+    def test_tool_timeout(self, tool_name: str, expected: int):
+        assert TIMEOUTS[tool_name] == expected
 
     def test_default_timeout_is_120s(self):
         assert DEFAULT_TIMEOUT == 120
 
 
-class TestCheckGremlinVersion:
-    @pytest.mark.asyncio
-    async def test_accepts_current_version(self):
-        mock_result = RunResult(stdout="0.1.14\n", stderr="", exit_code=0)
-        with patch("g_gremlin_hubspot_mcp.runner.run_raw", new_callable=AsyncMock, return_value=mock_result), \
-             patch("g_gremlin_hubspot_mcp.runner._find_gremlin", return_value="g-gremlin"):
-            version = await check_gremlin_version()
-            assert version == "0.1.14"
-
-    @pytest.mark.asyncio
-    async def test_accepts_higher_version(self):
-        mock_result = RunResult(stdout="0.2.0\n", stderr="", exit_code=0)
-        with patch("g_gremlin_hubspot_mcp.runner.run_raw", new_callable=AsyncMock, return_value=mock_result), \
-             patch("g_gremlin_hubspot_mcp.runner._find_gremlin", return_value="g-gremlin"):
-            version = await check_gremlin_version()
-            assert version == "0.2.0"
-
-    @pytest.mark.asyncio
-    async def test_rejects_old_version(self):
-        mock_result = RunResult(stdout="0.1.0\n", stderr="", exit_code=0)
-        with patch("g_gremlin_hubspot_mcp.runner.run_raw", new_callable=AsyncMock, return_value=mock_result), \
-             patch("g_gremlin_hubspot_mcp.runner._find_gremlin", return_value="g-gremlin"):
-            with pytest.raises(RuntimeError, match=">=0.1.14 required"):
-                await check_gremlin_version()
+@pytest.fixture
+def mock_run_raw(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """AsyncMock standing in for run_raw, with g-gremlin always found."""
+    mock = AsyncMock(return_value=success_result("ok"))
+    monkeypatch.setattr(runner_mod, "run_raw", mock)
+    monkeypatch.setattr(runner_mod, "_find_gremlin", lambda: "g-gremlin")
+    return mock
+
 
-    @pytest.mark.asyncio
-    async def test_handles_prefixed_version(self):
-        mock_result = RunResult(stdout="g-gremlin 0.1.14\n", stderr="", exit_code=0)
-        with patch("g_gremlin_hubspot_mcp.runner.run_raw", new_callable=AsyncMock, return_value=mock_result), \
-             patch("g_gremlin_hubspot_mcp.runner._find_gremlin", return_value="g-gremlin"):
-            version = await check_gremlin_version()
-            assert version == "0.1.14"
+class TestCheckGremlinVersion:
+    @pytest.mark.parametrize("stdout,expected", [
+        ("0.1.14\n", "0.1.14"),
+        ("0.2.0\n", "0.2.0"),
+        ("g-gremlin 0.1.14\n", "0.1.14"),
+        ("0.2.0rc1\n", "0.2.0rc1"),  # pre-release compared via packaging
+    ])
+    async def test_accepts(self, mock_run_raw, stdout: str, expected: str):
+        mock_run_raw.return_value = success_result(stdout)
+        assert await check_gremlin_version() == expected
+
+    @pytest.mark.parametrize("stdout,match", [
+        ("0.1.0\n", ">=0.1.14 required"),
+        ("unknown\n", "Could not parse"),
+    ])
+    async def test_rejects(self, mock_run_raw, stdout: str, match: str):
+        mock_run_raw.return_value = success_result(stdout)
+        with pytest.raises(RuntimeError, match=match):
+            await check_gremlin_version()
 
-    @pytest.mark.asyncio
     async def test_raises_on_missing(self):
-        with patch("g_gremlin_hubspot_mcp.runner._find_gremlin", side_effect=RuntimeError("not found")):
+        with patch.object(runner_mod, "_find_gremlin", side_effect=RuntimeError("not found")):
             with pytest.raises(RuntimeError, match="not found"):
                 await check_gremlin_version()
 
 
+class TestFindGremlin:
+    def test_caches_resolved_path(self, tmp_path):
+        runner_mod._find_gremlin.cache_clear()
+        try:
+            with patch.object(runner_mod.sys, "executable", str(tmp_path / "python")), \
+                 patch.object(runner_mod.shutil, "which", return_value="/usr/bin/g-gremlin") as mock_which:
+                assert runner_mod._find_gremlin() == "/usr/bin/g-gremlin"
+                assert runner_mod._find_gremlin() == "/usr/bin/g-gremlin"
+                assert mock_which.call_count == 1
+        finally:
+            runner_mod._find_gremlin.cache_clear()
+
+    def test_missing_is_not_cached(self, tmp_path):
+        runner_mod._find_gremlin.cache_clear()
+        try:
+            with patch.object(runner_mod.sys, "executable", str(tmp_path / "python")), \
+                 patch.object(runner_mod.shutil, "which", side_effect=[None, "/usr/bin/g-gremlin"]):
+                with pytest.raises(RuntimeError, match="g-gremlin not found"):
+                    runner_mod._find_gremlin()
+                assert runner_mod._find_gremlin() == "/usr/bin/g-gremlin"
+        finally:
+            runner_mod._find_gremlin.cache_clear()
+
+
 class TestRunGremlin:
-    @pytest.mark.asyncio
-    async def test_uses_tool_timeout(self):
-        mock_result = RunResult(stdout="ok", stderr="", exit_code=0)
-        with patch("g_gremlin_hubspot_mcp.runner.run_raw", new_callable=AsyncMock, return_value=mock_result) as mock_raw, \
-             patch("g_gremlin_hubspot_mcp.runner._find_gremlin", return_value="g-gremlin"):
-            await run_gremlin(["hubspot", "whoami"], tool_name="whoami")
-            # Verify the timeout used was 30s (whoami timeout)
-            _, kwargs = mock_raw.call_args
-            assert kwargs["timeout"] == 30
-
-    @pytest.mark.asyncio
-    async def test_uses_override_timeout(self):
-        mock_result = RunResult(stdout="ok", stderr="", exit_code=0)
-        with patch("g_gremlin_hubspot_mcp.runner.run_raw", new_callable=AsyncMock, return_value=mock_result) as mock_raw, \
-             patch("g_gremlin_hubspot_mcp.runner._find_gremlin", return_value="g-gremlin"):
-            await run_gremlin(["hubspot", "whoami"], tool_name="whoami", timeout=999)
-            _, kwargs = mock_raw.call_args
-            assert kwargs["timeout"] == 999
+    async def test_uses_tool_timeout(self, mock_run_raw):
+        await run_gremlin(["hubspot", "whoami"], tool_name="whoami")
+        # Verify the timeout used was 30s (whoami timeout)
+        _, kwargs = mock_run_raw.call_args
+        assert kwargs["timeout"] == 30
+
+    async def test_uses_override_timeout(self, mock_run_raw):
+        await run_gremlin(["hubspot", "whoami"], tool_name="whoami", timeout=999)
+        _, kwargs = mock_run_raw.call_args
+        assert kwargs["timeout"] == 999
+
+
+def _fake_proc(stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0) -> SimpleNamespace:
+    """Fake asyncio Process whose communicate() returns the given output."""
+    return SimpleNamespace(
+        communicate=AsyncMock(return_value=(stdout, stderr)),
+        wait=AsyncMock(return_value=returncode),
+        kill=Mock(),
+        returncode=returncode,
+    )
+
+
+async def _never_finish() -> None:
+    """communicate() stand-in for a command that never exits."""
+    await asyncio.Event().wait()
 
 
 class TestRunRaw:
-    @pytest.mark.asyncio
     async def test_uses_devnull_for_stdin(self):
-        mock_proc = MagicMock()
-        mock_proc.communicate = AsyncMock(return_value=(b"ok", b""))
-        mock_proc.returncode = 0
+        mock_proc = _fake_proc(stdout=b"ok")
 
-        with patch(
-            "g_gremlin_hubspot_mcp.runner.asyncio.create_subprocess_exec",
+        with patch.object(
+            runner_mod.asyncio,
+            "create_subprocess_exec",
             new_callable=AsyncMock,
             return_value=mock_proc,
         ) as mock_exec:
             result = await runner_mod.run_raw(["g-gremlin", "--version"], timeout=10)
 
         assert result.ok is True
+        assert result.stdout == "ok"
         _, kwargs = mock_exec.call_args
         assert kwargs["stdin"] == runner_mod.DEVNULL
+
+    async def test_captures_large_output_and_exit_code(self):
+        big = b"x" * ((1 << 20) + 123)
+        mock_proc = _fake_proc(stdout=big, stderr=b"warn", returncode=2)
+
+        with patch.object(
+            runner_mod.asyncio,
+            "create_subprocess_exec",
+            new_callable=AsyncMock,
+            return_value=mock_proc,
+        ):
+            result = await runner_mod.run_raw(["g-gremlin", "hubspot", "pull"], timeout=10)
+
+        assert len(result.stdout) == len(big)
+        assert result.stderr == "warn"
+        assert result.exit_code == 2
+
+    async def test_timeout_kills_and_reaps(self):
+        mock_proc = _fake_proc()
+        mock_proc.communicate = AsyncMock(side_effect=_never_finish)
+
+        with patch.object(
+            runner_mod.asyncio,
+            "create_subprocess_exec",
+            new_callable=AsyncMock,
+            return_value=mock_proc,
+        ):
+            result = await runner_mod.run_raw(["g-gremlin", "hubspot", "pull"], timeout=0.05)
+
+        assert result.exit_code == -1
+        assert "timed out" in result.stderr
+        mock_proc.kill.assert_called_once()
+        mock_proc.wait.assert_awaited_once()
+
+    async def test_decodes_only_stderr_tail(self):
+        noisy = b"e" * (runner_mod.STDERR_CAPTURE_BYTES * 4) + b"\nError: No cached schema found\n"
+        mock_proc = _fake_proc(stdout=b"ok", stderr=noisy)
+
+        with patch.object(
+            runner_mod.asyncio,
+            "create_subprocess_exec",
+            new_callable=AsyncMock,
+            return_value=mock_proc,
+        ):
+            result = await runner_mod.run_raw(["g-gremlin", "hubspot", "pull"], timeout=10)
+
+        assert len(result.stderr) == runner_mod.STDERR_CAPTURE_BYTES
+        assert result.stderr.endswith("No cached schema found\n")
@@ -2,36 +2,45 @@
 
 from __future__ import annotations
 
+import pytest
+
 from g_gremlin_hubspot_mcp import server as server_mod
 
 
-def test_create_mcp_server_uses_version_when_supported(monkeypatch):
-    calls: list[dict[str, str]] = []
+class FakeFastMCP:
+    """Records constructor kwargs; optionally rejects the version kwarg."""
 
-    class FakeFastMCP:
-        def __init__(self, name: str, **kwargs):
-            assert name == "g-gremlin-hubspot"
-            calls.append(kwargs)
+    _raise = False
+    calls: list[dict[str, str]] = []
 
+    def __init__(self, name: str, **kwargs):
+        assert name == "g-gremlin-hubspot"
+        self.calls.append(kwargs)
+        if self._raise and "version" in kwargs:
+            raise TypeError("FastMCP.__init__() got an unexpected keyword argument 'version'")
+
+
+@pytest.mark.parametrize("raise_on_version,expected_calls", [
+    (False, [{"version": server_mod.__version__}]),
+    (True, [{"version": server_mod.__version__}, {}]),
+])
+def test_create_mcp_server_version_kwarg(monkeypatch, raise_on_version, expected_calls):
+    """version= is passed when supported and dropped when FastMCP rejects it."""
+    monkeypatch.setattr(FakeFastMCP, "_raise", raise_on_version)
+    monkeypatch.setattr(FakeFastMCP, "calls", [])
     monkeypatch.setattr(server_mod, "FastMCP", FakeFastMCP)
 
     server = server_mod._create_mcp_server()
     assert isinstance(server, FakeFastMCP)
-    assert calls == [{"version": server_mod.__version__}]
+    assert FakeFastMCP.calls == expected_calls
 
 
-def test_create_mcp_server_falls_back_when_version_kwarg_not_supported(monkeypatch):
-    calls: list[dict[str, str]] = []
+async def test_tool_wrapper_imports_implementation_lazily(monkeypatch):
+    from g_gremlin_hubspot_mcp.tools import read as read_mod
 
-    class FakeFastMCP:
-        def __init__(self, name: str, **kwargs):
-            assert name == "g-gremlin-hubspot"
-            calls.append(kwargs)
-            if "version" in kwargs:
-                raise TypeError("FastMCP.__init__() got an unexpected keyword argument 'version'")
+    async def fake_whoami() -> str:
+        return "whoami-envelope"
 
-    monkeypatch.setattr(server_mod, "FastMCP", FakeFastMCP)
+    monkeypatch.setattr(read_mod, "hubspot_auth_whoami", fake_whoami)
 
-    server = server_mod._create_mcp_server()
-    assert isinstance(server, FakeFastMCP)
-    assert calls == [{"version": server_mod.__version__}, {}]
+    assert await server_mod.tool_whoami() == "whoami-envelope"
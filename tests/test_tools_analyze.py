@@ -2,46 +2,45 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
-import pytest
-
-from g_gremlin_hubspot_mcp.envelope import compute_plan_hash
-from g_gremlin_hubspot_mcp.runner import RunResult
+from g_gremlin_hubspot_mcp import envelope as envelope_mod
+from g_gremlin_hubspot_mcp.envelope import compute_file_hash, compute_plan_hash, extract_agentic_result
+from g_gremlin_hubspot_mcp.tools import analyze as analyze_mod
 from g_gremlin_hubspot_mcp.tools.analyze import (
     hubspot_dedupe_plan,
     hubspot_props_drift,
+    hubspot_snapshot_create,
     hubspot_snapshot_diff,
 )
 
-GOLDEN_DIR = Path(__file__).parent / "golden"
+from conftest import dumps as json_dumps, loads as json_loads, make_run_result, success_result
 
+_PLAN_JSON = json_dumps({"groups": [{"key": "a@b.com", "primary": "1", "secondaries": ["2"]}]})
+_TWO_GROUP_PLAN_JSON = json_dumps(
+    {"groups": [{"primary": "1", "secondaries": ["2", "3"]}, {"primary": "4", "secondaries": ["5"]}]}
+)
 
-class TestDedupePlan:
-    @pytest.mark.asyncio
-    async def test_success_includes_plan_hash(self, tmp_path: Path):
-        golden = (GOLDEN_DIR / "merge_plan.json").read_text(encoding="utf-8")
 
-        # Mock run_gremlin and also mock the temp file creation
-        with patch("g_gremlin_hubspot_mcp.tools.analyze.run_gremlin", new_callable=AsyncMock) as mock, \
-             patch("g_gremlin_hubspot_mcp.tools.analyze.create_temp_dir") as mock_dir, \
-             patch("g_gremlin_hubspot_mcp.tools.analyze.cleanup_run_dir"):
+class TestDedupePlan:
+    async def test_success_includes_plan_hash(self, tmp_path: Path, goldens, mock_run_gremlin):
+        # run_gremlin is mocked by the fixture; also mock the temp file creation
+        with patch.object(analyze_mod, "create_temp_dir") as mock_dir, \
+             patch.object(analyze_mod, "cleanup_run_dir"):
 
             mock_dir.return_value = tmp_path
-            mock.return_value = RunResult(stdout=golden, stderr="", exit_code=0)
+            mock_run_gremlin.return_value = success_result(goldens["merge_plan"])
 
             # Write a plan file that the tool would expect
-            plan_data = {"groups": [{"key": "a@b.com", "primary": "1", "secondaries": ["2"]}]}
             plan_path = tmp_path / "merge_plan.json"
-            plan_path.write_text(json.dumps(plan_data), encoding="utf-8")
+            plan_path.write_text(_PLAN_JSON, encoding="utf-8")
 
             result = await hubspot_dedupe_plan(
                 object_type="contacts",
                 key_column="email",
             )
-            parsed = json.loads(result)
+            parsed = json_loads(result)
 
             assert parsed["ok"] is True
             assert parsed["safety"]["impact"] == "analyze"
@@ -50,14 +49,56 @@ class TestDedupePlan:
             # Data should include plan info
             assert "plan_hash" in parsed["data"]
 
-    @pytest.mark.asyncio
-    async def test_passes_key_column_and_keep(self):
-        with patch("g_gremlin_hubspot_mcp.tools.analyze.run_gremlin", new_callable=AsyncMock) as mock, \
-             patch("g_gremlin_hubspot_mcp.tools.analyze.create_temp_dir") as mock_dir, \
-             patch("g_gremlin_hubspot_mcp.tools.analyze.cleanup_run_dir"):
+    async def test_artifact_plan_hashes_bytes_without_parsing(self, tmp_path: Path, goldens, mock_run_gremlin):
+        with patch.object(analyze_mod, "create_temp_dir") as mock_dir, \
+             patch.object(analyze_mod, "should_inline", return_value=False), \
+             patch.object(analyze_mod, "read_json_file") as mock_read:
+
+            mock_dir.return_value = tmp_path
+            mock_run_gremlin.return_value = success_result(goldens["merge_plan"])
+            plan_path = tmp_path / "merge_plan.json"
+            plan_path.write_text('{"groups": []}', encoding="utf-8")
+
+            parsed = json_loads(await hubspot_dedupe_plan(object_type="contacts", key_column="email"))
+
+            assert parsed["safety"]["plan_hash"] == compute_file_hash(plan_path)
+            assert parsed["artifact"]["path"] == str(plan_path)
+            mock_read.assert_not_called()
+            # Counts come from the CLI summary, even for artifact plans
+            assert parsed["summary"] == "Found 3 duplicate groups, 5 merges planned"
+
+    async def test_extracts_agentic_result_once(self, tmp_path: Path, goldens, mock_run_gremlin):
+        with patch.object(analyze_mod, "create_temp_dir", return_value=tmp_path), \
+             patch.object(analyze_mod, "cleanup_run_dir"), \
+             patch.object(analyze_mod, "extract_agentic_result", wraps=extract_agentic_result) as spy, \
+             patch.object(envelope_mod, "extract_agentic_result") as envelope_extract:
+            mock_run_gremlin.return_value = success_result(goldens["merge_plan"])
+            (tmp_path / "merge_plan.json").write_text(_PLAN_JSON, encoding="utf-8")
+
+            parsed = json_loads(await hubspot_dedupe_plan(object_type="contacts", key_column="email"))
+
+            spy.assert_called_once()
+            envelope_extract.assert_not_called()
+            assert parsed["raw"]["agentic_result"]["$schema"] == "AgenticResult/v1"
+            assert parsed["summary"] == "Found 3 duplicate groups, 5 merges planned"
+
+    async def test_counts_from_plan_without_cli_summary(self, tmp_path: Path, mock_run_gremlin):
+        with patch.object(analyze_mod, "create_temp_dir", return_value=tmp_path), \
+             patch.object(analyze_mod, "cleanup_run_dir"):
+            mock_run_gremlin.return_value = success_result("")
+            (tmp_path / "merge_plan.json").write_text(_TWO_GROUP_PLAN_JSON, encoding="utf-8")
+
+            parsed = json_loads(await hubspot_dedupe_plan(object_type="contacts", key_column="email"))
+
+            assert parsed["data"]["duplicate_groups"] == 2
+            assert parsed["data"]["total_merges"] == 3
+
+    async def test_passes_key_column_and_keep(self, mock_run_gremlin):
+        with patch.object(analyze_mod, "create_temp_dir") as mock_dir, \
+             patch.object(analyze_mod, "cleanup_run_dir"):
 
             mock_dir.return_value = Path("/tmp/test")
-            mock.return_value = RunResult(stdout="{}", stderr="", exit_code=1)
+            mock_run_gremlin.return_value = make_run_result(stdout="{}", exit_code=1)
 
             await hubspot_dedupe_plan(
                 object_type="companies",
@@ -66,7 +107,7 @@ class TestDedupePlan:
                 where=["lifecyclestage=customer"],
             )
 
-            args = mock.call_args[0][0]
+            args = mock_run_gremlin.call_args[0][0]
             assert "--key-column" in args
             assert "domain" in args
             assert "--keep" in args
@@ -76,23 +117,35 @@ class TestDedupePlan:
 
 
 class TestPropsDrift:
-    @pytest.mark.asyncio
-    async def test_passes_spec_path(self):
-        with patch("g_gremlin_hubspot_mcp.tools.analyze.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout='{"drifts": []}', stderr="", exit_code=0)
-            await hubspot_props_drift("/path/to/spec.yaml")
+    async def test_passes_spec_path(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result('{"drifts": []}')
+        await hubspot_props_drift("/path/to/spec.yaml")
 
-            args = mock.call_args[0][0]
-            assert "/path/to/spec.yaml" in args
+        args = mock_run_gremlin.call_args[0][0]
+        assert "/path/to/spec.yaml" in args
 
 
 class TestSnapshotDiff:
-    @pytest.mark.asyncio
-    async def test_passes_both_paths(self):
-        with patch("g_gremlin_hubspot_mcp.tools.analyze.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout='{"changes": []}', stderr="", exit_code=0)
-            await hubspot_snapshot_diff("/snap/a", "/snap/b")
-
-            args = mock.call_args[0][0]
-            assert "/snap/a" in args
-            assert "/snap/b" in args
+    async def test_passes_both_paths(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result('{"changes": []}')
+        await hubspot_snapshot_diff("/snap/a", "/snap/b")
+
+        args = mock_run_gremlin.call_args[0][0]
+        assert "/snap/a" in args
+        assert "/snap/b" in args
+
+
+class TestSnapshotCreate:
+    async def test_counts_nested_files(self, tmp_path: Path, mock_run_gremlin):
+        snap_dir = tmp_path / "snapshot"
+        (snap_dir / "schema").mkdir(parents=True)
+        (snap_dir / "counts.json").write_text("{}", encoding="utf-8")
+        (snap_dir / "schema" / "contacts.json").write_text("{}", encoding="utf-8")
+        (snap_dir / "empty").mkdir()
+
+        with patch.object(analyze_mod, "create_temp_dir", return_value=tmp_path):
+            mock_run_gremlin.return_value = success_result("{}")
+            parsed = json_loads(await hubspot_snapshot_create())
+
+            assert parsed["data"]["file_count"] == 2
+            assert parsed["data"]["snapshot_dir"] == str(snap_dir)
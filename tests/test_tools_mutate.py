@@ -8,22 +8,39 @@ Critical tests:
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 import pytest
 
-from g_gremlin_hubspot_mcp.envelope import compute_plan_hash
-from g_gremlin_hubspot_mcp.runner import RunResult
+from g_gremlin_hubspot_mcp.envelope import compute_bytes_hash, compute_file_hash, compute_plan_hash
+from g_gremlin_hubspot_mcp.tools import mutate as mutate_mod
 from g_gremlin_hubspot_mcp.tools.mutate import (
     hubspot_dedupe_apply,
     hubspot_objects_upsert,
 )
 
+from conftest import dumps as json_dumps, loads as json_loads, success_result
+
+_PLAN = {"groups": [{"key": "a@b.com", "primary": "1", "secondaries": ["2"]}]}
+_PLAN_JSON = json_dumps(_PLAN)
+_PLAN_JSON_INDENTED = json_dumps(_PLAN, indent=True)
+_PLAN_HASH = compute_plan_hash(_PLAN)
+
+_DRY_RUN_PLAN_JSON = json_dumps(
+    {"groups": [{"key": "test@test.com", "primary": "10", "secondaries": ["11"]}]}
+)
+_DRY_RUN_PLAN_HASH = compute_bytes_hash(_DRY_RUN_PLAN_JSON.encode("utf-8"))
+
+@pytest.fixture
+def plan_file(tmp_path: Path) -> Path:
+    """_PLAN written to disk as compact JSON."""
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(_PLAN_JSON, encoding="utf-8")
+    return plan_path
+
 
 class TestUpsertSafety:
-    @pytest.mark.asyncio
     async def test_apply_without_hash_rejected(self):
         """apply=true without plan_hash must be rejected."""
         result = await hubspot_objects_upsert(
@@ -33,57 +50,44 @@ class TestUpsertSafety:
             apply=True,
             plan_hash=None,
         )
-        parsed = json.loads(result)
+        parsed = json_loads(result)
         assert parsed["ok"] is False
-        assert "plan_hash" in parsed["summary"].lower()
+        assert "plan_hash" in parsed["summary"]
 
-    @pytest.mark.asyncio
-    async def test_dry_run_returns_hash(self):
+    async def test_dry_run_returns_hash(self, mock_run_gremlin):
         """Dry-run should return a plan_hash for two-phase apply."""
-        with patch("g_gremlin_hubspot_mcp.tools.mutate.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(
-                stdout='{"preview": "5 records to upsert"}',
-                stderr="",
-                exit_code=0,
-            )
-            result = await hubspot_objects_upsert(
-                object_type="contacts",
-                csv_path="/path/to/data.csv",
-                id_column="email",
-                apply=False,
-            )
-            parsed = json.loads(result)
+        mock_run_gremlin.return_value = success_result('{"preview": "5 records to upsert"}')
+        result = await hubspot_objects_upsert(
+            object_type="contacts",
+            csv_path="/path/to/data.csv",
+            id_column="email",
+            apply=False,
+        )
+        parsed = json_loads(result)
 
-            assert parsed["ok"] is True
-            assert parsed["safety"]["dry_run"] is True
-            assert parsed["safety"]["requires_apply"] is True
-            assert parsed["safety"]["plan_hash"].startswith("sha256:")
-            assert parsed["safety"]["impact"] == "write"
+        assert parsed["ok"] is True
+        assert parsed["safety"]["dry_run"] is True
+        assert parsed["safety"]["requires_apply"] is True
+        assert parsed["safety"]["plan_hash"].startswith("sha256:")
+        assert parsed["safety"]["impact"] == "write"
 
-    @pytest.mark.asyncio
-    async def test_apply_with_hash_proceeds(self):
+    async def test_apply_with_hash_proceeds(self, mock_run_gremlin):
         """apply=true with plan_hash should proceed to execution."""
-        with patch("g_gremlin_hubspot_mcp.tools.mutate.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(
-                stdout='{"applied": true, "count": 5}',
-                stderr="",
-                exit_code=0,
-            )
-            result = await hubspot_objects_upsert(
-                object_type="contacts",
-                csv_path="/path/to/data.csv",
-                id_column="email",
-                apply=True,
-                plan_hash="sha256:abc123",
-            )
-            parsed = json.loads(result)
+        mock_run_gremlin.return_value = success_result('{"applied": true, "count": 5}')
+        result = await hubspot_objects_upsert(
+            object_type="contacts",
+            csv_path="/path/to/data.csv",
+            id_column="email",
+            apply=True,
+            plan_hash="sha256:abc123",
+        )
+        parsed = json_loads(result)
 
-            assert parsed["ok"] is True
-            assert parsed["safety"]["dry_run"] is False
+        assert parsed["ok"] is True
+        assert parsed["safety"]["dry_run"] is False
 
 
 class TestDedupeApplySafety:
-    @pytest.mark.asyncio
     async def test_apply_without_hash_rejected(self):
         """apply=true without plan_hash must be rejected."""
         result = await hubspot_dedupe_apply(
@@ -91,77 +95,100 @@ class TestDedupeApplySafety:
             apply=True,
             plan_hash=None,
         )
-        parsed = json.loads(result)
+        parsed = json_loads(result)
         assert parsed["ok"] is False
-        assert "plan_hash" in parsed["summary"].lower()
+        assert "plan_hash" in parsed["summary"]
 
-    @pytest.mark.asyncio
-    async def test_hash_mismatch_rejected(self, tmp_path: Path):
+    async def test_hash_mismatch_rejected(self, plan_file: Path):
         """apply with wrong plan_hash must be rejected."""
-        plan_data = {"groups": [{"key": "a@b.com", "primary": "1", "secondaries": ["2"]}]}
-        plan_path = tmp_path / "plan.json"
-        plan_path.write_text(json.dumps(plan_data), encoding="utf-8")
-
-        correct_hash = compute_plan_hash(plan_data)
         wrong_hash = "sha256:0000000000000000000000000000000000000000000000000000000000000000"
-        assert correct_hash != wrong_hash
+        assert _PLAN_HASH != wrong_hash
 
         result = await hubspot_dedupe_apply(
-            plan_file=str(plan_path),
+            plan_file=str(plan_file),
             apply=True,
             plan_hash=wrong_hash,
         )
-        parsed = json.loads(result)
+        parsed = json_loads(result)
         assert parsed["ok"] is False
-        assert "mismatch" in parsed["summary"].lower()
+        assert "mismatch" in parsed["summary"]
 
-    @pytest.mark.asyncio
-    async def test_correct_hash_proceeds(self, tmp_path: Path):
+    async def test_correct_hash_proceeds(self, plan_file: Path, mock_run_gremlin):
         """apply with correct plan_hash should proceed."""
-        plan_data = {"groups": [{"key": "a@b.com", "primary": "1", "secondaries": ["2"]}]}
-        plan_path = tmp_path / "plan.json"
-        plan_path.write_text(json.dumps(plan_data), encoding="utf-8")
+        mock_run_gremlin.return_value = success_result('{"merged": 1}')
+        result = await hubspot_dedupe_apply(
+            plan_file=str(plan_file),
+            apply=True,
+            plan_hash=_PLAN_HASH,
+        )
+        parsed = json_loads(result)
 
-        correct_hash = compute_plan_hash(plan_data)
+        assert parsed["ok"] is True
+        assert parsed["safety"]["dry_run"] is False
+        assert parsed["safety"]["impact"] == "merge"
 
-        with patch("g_gremlin_hubspot_mcp.tools.mutate.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(
-                stdout='{"merged": 1}',
-                stderr="",
-                exit_code=0,
-            )
+    async def test_apply_reads_plan_once(self, tmp_path: Path, mock_run_gremlin):
+        """Byte-hash and canonical-hash checks share a single read."""
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_text(_PLAN_JSON_INDENTED, encoding="utf-8")
+
+        with patch.object(Path, "read_bytes", autospec=True, side_effect=Path.read_bytes) as spy:
+            mock_run_gremlin.return_value = success_result('{"merged": 1}')
             result = await hubspot_dedupe_apply(
                 plan_file=str(plan_path),
                 apply=True,
-                plan_hash=correct_hash,
+                plan_hash=_PLAN_HASH,
             )
-            parsed = json.loads(result)
 
-            assert parsed["ok"] is True
-            assert parsed["safety"]["dry_run"] is False
-            assert parsed["safety"]["impact"] == "merge"
+        assert json_loads(result)["ok"] is True
+        spy.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_dry_run_returns_hash(self, tmp_path: Path):
+    async def test_dry_run_returns_hash(self, tmp_path: Path, mock_run_gremlin):
         """Dry-run should return the plan_hash for two-phase."""
-        plan_data = {"groups": [{"key": "test@test.com", "primary": "10", "secondaries": ["11"]}]}
         plan_path = tmp_path / "plan.json"
-        plan_path.write_text(json.dumps(plan_data), encoding="utf-8")
+        plan_path.write_text(_DRY_RUN_PLAN_JSON, encoding="utf-8")
 
-        expected_hash = compute_plan_hash(plan_data)
+        mock_run_gremlin.return_value = success_result('{"preview": "1 merge planned"}')
+        result = await hubspot_dedupe_apply(
+            plan_file=str(plan_path),
+            apply=False,
+        )
+        parsed = json_loads(result)
 
-        with patch("g_gremlin_hubspot_mcp.tools.mutate.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(
-                stdout='{"preview": "1 merge planned"}',
-                stderr="",
-                exit_code=0,
-            )
-            result = await hubspot_dedupe_apply(
-                plan_file=str(plan_path),
-                apply=False,
-            )
-            parsed = json.loads(result)
+        assert parsed["ok"] is True
+        assert parsed["safety"]["dry_run"] is True
+        assert parsed["safety"]["plan_hash"] == _DRY_RUN_PLAN_HASH
+
+    async def test_review_hash_accepted_on_apply(self, tmp_path: Path, mock_run_gremlin):
+        """The byte hash returned by the dry-run review must pass verification."""
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_text(_PLAN_JSON + "\n", encoding="utf-8")
+
+        mock_run_gremlin.return_value = success_result('{"merged": 1}')
+        result = await hubspot_dedupe_apply(
+            plan_file=str(plan_path),
+            apply=True,
+            plan_hash=compute_file_hash(plan_path),
+        )
+
+        assert json_loads(result)["ok"] is True
+        mock_run_gremlin.assert_awaited_once()
+
+    async def test_dry_run_hash_cached_until_plan_changes(self, tmp_path: Path, mock_run_gremlin):
+        """Repeated dry-runs on an unchanged plan hash the file once."""
+        plan_path = tmp_path / "plan.json"
+        plan_path.write_text('{"groups": []}', encoding="utf-8")
+
+        with patch.object(mutate_mod, "compute_file_hash", wraps=compute_file_hash) as spy:
+            mock_run_gremlin.return_value = success_result("{}")
+            mutate_mod._hash_plan_file.cache_clear()
+
+            first = json_loads(await hubspot_dedupe_apply(plan_file=str(plan_path)))
+            second = json_loads(await hubspot_dedupe_apply(plan_file=str(plan_path)))
+            assert spy.call_count == 1
+            assert first["safety"]["plan_hash"] == second["safety"]["plan_hash"]
 
-            assert parsed["ok"] is True
-            assert parsed["safety"]["dry_run"] is True
-            assert parsed["safety"]["plan_hash"] == expected_hash
+            plan_path.write_text('{"groups": [{"primary": "1"}]}', encoding="utf-8")
+            third = json_loads(await hubspot_dedupe_apply(plan_file=str(plan_path)))
+            assert spy.call_count == 2
+            assert third["safety"]["plan_hash"] == compute_file_hash(plan_path)
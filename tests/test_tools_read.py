@@ -2,169 +2,202 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
-import pytest
-
-from g_gremlin_hubspot_mcp.runner import RunResult
+from g_gremlin_hubspot_mcp.tools import read as read_mod
 from g_gremlin_hubspot_mcp.tools.read import (
     hubspot_auth_doctor,
     hubspot_auth_whoami,
+    hubspot_engagements_pull,
+    hubspot_objects_pull,
     hubspot_objects_query,
+    hubspot_props_list,
     hubspot_schema_get,
     hubspot_schema_list,
 )
 
-GOLDEN_DIR = Path(__file__).parent / "golden"
-
-
-def _golden(name: str) -> str:
-    return (GOLDEN_DIR / f"{name}.json").read_text(encoding="utf-8")
+from conftest import error_result, loads as json_loads, success_result
 
 
 class TestWhoami:
-    @pytest.mark.asyncio
-    async def test_success(self):
-        golden = _golden("whoami")
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout=golden, stderr="", exit_code=0)
-            result = await hubspot_auth_whoami()
-            parsed = json.loads(result)
-
-            assert parsed["$schema"] == "GremlinMCPResponse/v1"
-            assert parsed["ok"] is True
-            assert parsed["safety"]["impact"] == "read"
-            assert parsed["data"]["hub_id"] == 12345678
+    async def test_success(self, goldens, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result(goldens["whoami"])
+        result = await hubspot_auth_whoami()
+        parsed = json_loads(result)
 
-    @pytest.mark.asyncio
-    async def test_failure(self):
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout="", stderr="Error: token expired", exit_code=1)
-            result = await hubspot_auth_whoami()
-            parsed = json.loads(result)
+        assert parsed["$schema"] == "GremlinMCPResponse/v1"
+        assert parsed["ok"] is True
+        assert parsed["safety"]["impact"] == "read"
+        assert parsed["data"]["hub_id"] == 12345678
 
-            assert parsed["ok"] is False
-            assert "failed" in parsed["summary"].lower()
+    async def test_failure(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = error_result("Error: token expired")
+        result = await hubspot_auth_whoami()
+        parsed = json_loads(result)
+
+        assert parsed["ok"] is False
+        assert "failed" in parsed["summary"].lower()
 
 
 class TestDoctor:
-    @pytest.mark.asyncio
-    async def test_success(self):
-        golden = _golden("doctor")
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout=golden, stderr="", exit_code=0)
-            result = await hubspot_auth_doctor()
-            parsed = json.loads(result)
+    async def test_success(self, goldens, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result(goldens["doctor"])
+        result = await hubspot_auth_doctor()
+        parsed = json_loads(result)
 
-            assert parsed["ok"] is True
-            assert parsed["safety"]["impact"] == "read"
+        assert parsed["ok"] is True
+        assert parsed["safety"]["impact"] == "read"
+        assert parsed["data"]["overall_status"] == "healthy"
+        assert parsed["raw"]["agentic_result"] is None
 
 
 class TestSchemaList:
-    @pytest.mark.asyncio
-    async def test_success(self):
-        golden = _golden("schema_ls")
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout=golden, stderr="", exit_code=0)
-            result = await hubspot_schema_list()
-            parsed = json.loads(result)
+    async def test_success(self, goldens, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result(goldens["schema_ls"])
+        result = await hubspot_schema_list()
+        parsed = json_loads(result)
 
-            assert parsed["ok"] is True
-            # Data should contain the schema list
-            assert "items" in parsed["data"] or isinstance(parsed["data"], list) or len(parsed["data"]) > 0
+        assert parsed["ok"] is True
+        # Data should contain the schema list
+        assert "items" in parsed["data"] or isinstance(parsed["data"], list) or len(parsed["data"]) > 0
 
 
 class TestSchemaGet:
-    @pytest.mark.asyncio
-    async def test_passes_object_type(self):
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout='{"name": "contacts"}', stderr="", exit_code=0)
-            await hubspot_schema_get("contacts")
+    async def test_passes_object_type(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result('{"name": "contacts"}')
+        await hubspot_schema_get("contacts")
 
-            args = mock.call_args[0][0]
-            assert "contacts" in args
+        args = mock_run_gremlin.call_args[0][0]
+        assert "contacts" in args
 
 
 class TestSchemaAutoSync:
-    @pytest.mark.asyncio
-    async def test_schema_list_auto_sync_on_cache_miss(self):
-        cache_miss = RunResult(
-            stdout="",
-            stderr="No cached schema found. Run: g-gremlin hubspot schema sync",
-            exit_code=1,
-        )
-        sync_ok = RunResult(stdout='{"ok": true}', stderr="", exit_code=0)
-        list_ok = RunResult(stdout='{"items":[{"name":"contacts"}]}', stderr="", exit_code=0)
+    async def test_schema_list_auto_sync_on_cache_miss(self, mock_run_gremlin):
+        cache_miss = error_result("No cached schema found. Run: g-gremlin hubspot schema sync")
+        sync_ok = success_result('{"ok": true}')
+        list_ok = success_result('{"items":[{"name":"contacts"}]}')
 
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.side_effect = [cache_miss, sync_ok, list_ok]
-            result = await hubspot_schema_list()
-            parsed = json.loads(result)
+        mock_run_gremlin.side_effect = [cache_miss, sync_ok, list_ok]
+        result = await hubspot_schema_list()
+        parsed = json_loads(result)
 
-            assert parsed["ok"] is True
-            assert "auto-synced" in parsed["summary"].lower()
-            assert mock.await_count == 3
-            assert mock.await_args_list[1].args[0] == ["hubspot", "schema", "sync", "--json"]
-
-    @pytest.mark.asyncio
-    async def test_schema_get_auto_sync_on_cache_miss(self):
-        cache_miss = RunResult(
-            stdout="",
-            stderr="No cached schema found. Run: g-gremlin hubspot schema sync",
-            exit_code=1,
-        )
-        sync_ok = RunResult(stdout='{"ok": true}', stderr="", exit_code=0)
-        get_ok = RunResult(stdout='{"name":"contacts"}', stderr="", exit_code=0)
+        assert parsed["ok"] is True
+        assert "auto-synced" in parsed["summary"]
+        assert mock_run_gremlin.await_count == 3
+        assert list(mock_run_gremlin.await_args_list[1].args[0]) == ["hubspot", "schema", "sync", "--json"]
 
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.side_effect = [cache_miss, sync_ok, get_ok]
-            result = await hubspot_schema_get("contacts")
-            parsed = json.loads(result)
+    async def test_schema_get_auto_sync_on_cache_miss(self, mock_run_gremlin):
+        cache_miss = error_result("No cached schema found. Run: g-gremlin hubspot schema sync")
+        sync_ok = success_result('{"ok": true}')
+        get_ok = success_result('{"name":"contacts"}')
 
-            assert parsed["ok"] is True
-            assert "auto-synced" in parsed["summary"].lower()
-            assert mock.await_count == 3
-            assert mock.await_args_list[2].args[0] == ["hubspot", "schema", "show", "contacts", "--json"]
+        mock_run_gremlin.side_effect = [cache_miss, sync_ok, get_ok]
+        result = await hubspot_schema_get("contacts")
+        parsed = json_loads(result)
+
+        assert parsed["ok"] is True
+        assert "auto-synced" in parsed["summary"]
+        assert mock_run_gremlin.await_count == 3
+        assert mock_run_gremlin.await_args_list[2].args[0] == ["hubspot", "schema", "show", "contacts", "--json"]
+
+    async def test_schema_list_does_not_sync_on_other_errors(self, mock_run_gremlin):
+        auth_err = error_result("HubSpot authentication failed")
+
+        mock_run_gremlin.return_value = auth_err
+        result = await hubspot_schema_list()
+        parsed = json_loads(result)
+
+        assert parsed["ok"] is False
+        assert mock_run_gremlin.await_count == 1
 
-    @pytest.mark.asyncio
-    async def test_schema_list_does_not_sync_on_other_errors(self):
-        auth_err = RunResult(stdout="", stderr="HubSpot authentication failed", exit_code=1)
 
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = auth_err
-            result = await hubspot_schema_list()
-            parsed = json.loads(result)
+class TestPropsList:
+    async def test_many_types_single_invocation(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result('{"properties": []}')
+        await hubspot_props_list(["contacts", "companies,deals", " contacts "], match="email")
 
-            assert parsed["ok"] is False
-            assert mock.await_count == 1
+        mock_run_gremlin.assert_awaited_once()
+        args = mock_run_gremlin.call_args[0][0]
+        assert args[:4] == ["hubspot", "props", "list", "contacts,companies,deals"]
+        assert args[-2:] == ["--match", "email"]
+
+    async def test_string_passed_through(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result('{}')
+        await hubspot_props_list("contacts,companies")
+
+        assert mock_run_gremlin.call_args[0][0] == ["hubspot", "props", "list", "contacts,companies", "--json"]
 
 
 class TestObjectsQuery:
-    @pytest.mark.asyncio
-    async def test_passes_where_clauses(self):
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout='{"results": []}', stderr="", exit_code=0)
-            await hubspot_objects_query(
-                "contacts",
-                where=["email=@acme.com", "lifecyclestage=customer"],
-                limit=50,
+    async def test_passes_where_clauses(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result('{"results": []}')
+        await hubspot_objects_query(
+            "contacts",
+            where=["email=@acme.com", "lifecyclestage=customer"],
+            limit=50,
+        )
+
+        args = mock_run_gremlin.call_args[0][0]
+        assert "--where" in args
+        assert "email=@acme.com" in args
+        assert "lifecyclestage=customer" in args
+        assert "--limit" in args
+        assert "50" in args
+
+    async def test_default_limit_not_passed(self, mock_run_gremlin):
+        mock_run_gremlin.return_value = success_result('{}')
+        await hubspot_objects_query("contacts")
+
+        args = mock_run_gremlin.call_args[0][0]
+        # Default limit (100) should not add --limit
+        assert "--limit" not in args
+
+
+class TestObjectsPull:
+    async def test_small_csv_inlined(self, tmp_path: Path, mock_run_gremlin):
+        with patch.object(read_mod, "create_temp_dir", return_value=tmp_path), \
+             patch.object(read_mod, "cleanup_run_dir"):
+            mock_run_gremlin.return_value = success_result("{}")
+            (tmp_path / "contacts.csv").write_text(
+                'id,"email, primary"\n1,a@b.com\n2,c@d.com\n', encoding="utf-8"
             )
+            parsed = json_loads(await hubspot_objects_pull("contacts"))
+
+            assert parsed["ok"] is True
+            assert parsed["data"]["columns"] == ["id", "email, primary"]
+            assert parsed["data"]["count"] == 2
+            assert parsed["data"]["records"][1] == {"id": "2", "email, primary": "c@d.com"}
+
+    async def test_inline_columns_drop_padding_and_empty_cells(self, tmp_path: Path, mock_run_gremlin):
+        with patch.object(read_mod, "create_temp_dir", return_value=tmp_path), \
+             patch.object(read_mod, "cleanup_run_dir"):
+            mock_run_gremlin.return_value = success_result("{}")
+            (tmp_path / "contacts.csv").write_text("id, email ,\n1,a@b.com,\n", encoding="utf-8")
+            parsed = json_loads(await hubspot_objects_pull("contacts"))
+
+            assert parsed["data"]["columns"] == ["id", "email"]
+
+    async def test_missing_output_file_not_reported_as_artifact(self, tmp_path: Path, mock_run_gremlin):
+        with patch.object(read_mod, "create_temp_dir", return_value=tmp_path):
+            mock_run_gremlin.return_value = success_result("{}")
+            parsed = json_loads(await hubspot_objects_pull("contacts"))
+
+            assert parsed["ok"] is True
+            assert "artifact" not in parsed
+
+
+class TestEngagementsPull:
+    async def test_collects_metadata_for_every_type(self, tmp_path: Path, mock_run_gremlin):
+        out_dir = tmp_path / "engagements"
+        out_dir.mkdir()
+        (out_dir / "calls.csv").write_text("id\n1\n2\n", encoding="utf-8")
+        (out_dir / "emails.csv").write_text("id\n1\n", encoding="utf-8")
+
+        with patch.object(read_mod, "create_temp_dir", return_value=tmp_path):
+            mock_run_gremlin.return_value = success_result("{}")
+            parsed = json_loads(await hubspot_engagements_pull())
 
-            args = mock.call_args[0][0]
-            assert "--where" in args
-            assert "email=@acme.com" in args
-            assert "lifecyclestage=customer" in args
-            assert "--limit" in args
-            assert "50" in args
-
-    @pytest.mark.asyncio
-    async def test_default_limit_not_passed(self):
-        with patch("g_gremlin_hubspot_mcp.tools.read.run_gremlin", new_callable=AsyncMock) as mock:
-            mock.return_value = RunResult(stdout='{}', stderr="", exit_code=0)
-            await hubspot_objects_query("contacts")
-
-            args = mock.call_args[0][0]
-            # Default limit (100) should not add --limit
-            assert "--limit" not in args
+            assert parsed["data"]["total_files"] == 2
+            assert parsed["data"]["total_rows"] == 3
+            assert sorted(f["row_count"] for f in parsed["data"]["files"]) == [1, 2]